@@ -0,0 +1,248 @@
+"""
+Concurrency stress check and throughput comparison for DatabaseStorage.
+
+Phase 1 (correctness): writer threads add, edit and delete portfolio items
+and update orders while reader threads keep reading portfolio snapshots and
+order counts. Readers check every snapshot they get:
+- items are sorted by id, and by_id and by_category index exactly those items
+- no category holds more than one item (adding or moving an item replaces
+  the category's other items)
+- the snapshot cannot be modified
+Afterwards the cache, the sync snapshot file and the image reference counts
+must all match the database. Any violation makes the script exit non-zero.
+
+Phase 2 (throughput): the same read mix through the Flask test client,
+served by N processes x M threads, to compare threaded workers with
+process-only scaling.
+
+Usage:
+    python benchmarks/bench_concurrency.py --seconds 5 --readers 8 --writers 4
+    python benchmarks/bench_concurrency.py --configs 4x1,1x4,2x8 --io-wait-ms 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ['Printing Press', 'SEO', 'Packages Solutions']
+STATUSES = ['pending', 'in_progress', 'completed']
+
+
+def check_snapshot(storage):
+    """Return a list of invariant violations in one portfolio snapshot"""
+    problems = []
+    snapshot = storage._get_portfolio()
+    ids = [item['id'] for item in snapshot.items]
+    if ids != sorted(ids):
+        problems.append(f"items not sorted by id: {ids}")
+    if set(snapshot.by_id) != set(ids):
+        problems.append("by_id doesn't match items")
+    indexed = sorted(item['id'] for members in snapshot.by_category.values() for item in members)
+    if indexed != sorted(ids):
+        problems.append("by_category doesn't match items")
+    for category, members in snapshot.by_category.items():
+        if len(members) > 1:
+            problems.append(f"{len(members)} items in category {category}")
+    if snapshot.items:
+        try:
+            snapshot.items[0]['title'] = 'changed'
+            problems.append("snapshot item could be modified")
+        except TypeError:
+            pass
+    return problems
+
+
+def stress(simple_app, seconds, readers, writers, image_names):
+    """Run concurrent readers and writers; return (problems, read count, write count)"""
+    db = simple_app.db
+    stop = threading.Event()
+    lock = threading.Lock()
+    problems = []
+    counts = {'reads': 0, 'writes': 0}
+
+    def reader():
+        reads = 0
+        while not stop.is_set():
+            try:
+                found = check_snapshot(db)
+                db.count_orders_by_status()
+                for category in SERVICES:
+                    db.get_portfolio_items_by_category(category)
+            except Exception as e:
+                found = [f"reader error: {e!r}"]
+            reads += 1
+            if found:
+                with lock:
+                    problems.extend(found)
+        with lock:
+            counts['reads'] += reads
+
+    def writer():
+        writes = 0
+        while not stop.is_set():
+            action = random.random()
+            try:
+                items = db.get_portfolio_items()
+                if action < 0.35 or not items:
+                    db.add_portfolio_item('Stress item', 'Added by the stress check', random.choice(SERVICES),
+                                          random.choice(image_names))
+                elif action < 0.6:
+                    item = random.choice(items)
+                    db.update_portfolio_item(item['id'], 'Edited', 'Edited by the stress check',
+                                             random.choice(SERVICES), random.choice([None] + image_names))
+                elif action < 0.75:
+                    db.delete_portfolio_item(random.choice(items)['id'])
+                else:
+                    db.update_order_statuses(random.sample(range(1, 201), 10), random.choice(STATUSES))
+            except Exception as e:
+                with lock:
+                    problems.append(f"writer error: {e!r}")
+            writes += 1
+        with lock:
+            counts['writes'] += writes
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return problems, counts['reads'], counts['writes']
+
+
+def check_final_state(simple_app):
+    """Compare the cache, the snapshot file and image_refs with the database"""
+    db = simple_app.db
+    problems = []
+    conn = db._get_connection()
+    rows = [dict(row) for row in conn.execute('SELECT * FROM portfolio_items ORDER BY id')]
+    if [dict(item) for item in db.get_portfolio_items()] != rows:
+        problems.append("cached portfolio differs from the database")
+    snapshot = list(simple_app.iter_portfolio_snapshot(simple_app.PORTFOLIO_SNAPSHOT_PATH))[1:]  # Skip the header
+    if snapshot != rows:
+        problems.append("sync snapshot file differs from the database")
+    refs = {row[0]: row[1] for row in conn.execute('SELECT filename, refcount FROM image_refs WHERE refcount != 0')}
+    expected = {row[0]: row[1] for row in conn.execute(
+        'SELECT image_filename, COUNT(*) FROM portfolio_items GROUP BY image_filename')}
+    if refs != expected:
+        problems.append(f"image_refs {refs} != {expected}")
+    return problems
+
+
+def throughput_worker(threads, seconds, io_wait, start, results):
+    """Serve the read mix from `threads` threads in this process for `seconds`"""
+    import simple_app
+
+    client = simple_app.app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+    top = simple_app.db._fetch_one('SELECT MAX(seq) AS seq FROM order_changes')['seq'] or 0
+    paths = ['/api/check-notifications', '/api/dashboard/trends', f'/api/orders/changes?since={top}',
+             '/uploads/portfolio/stress-a.jpg']
+    start.wait()
+    deadline = time.monotonic() + seconds
+    done = []
+
+    def run():
+        count = 0
+        local_client = simple_app.app.test_client()
+        local_client.set_cookie('session', client.get_cookie('session').value)
+        while time.monotonic() < deadline:
+            local_client.get(random.choice(paths)).close()
+            simple_app.db.get_portfolio_items()
+            if io_wait:
+                time.sleep(io_wait)
+            count += 1
+        done.append(count)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put(sum(done))
+
+
+def measure_config(processes, threads, seconds, io_wait):
+    context = multiprocessing.get_context('fork')
+    start = context.Event()
+    results = context.Queue()
+    children = [context.Process(target=throughput_worker, args=(threads, seconds, io_wait, start, results))
+                for _ in range(processes)]
+    for child in children:
+        child.start()
+    time.sleep(0.5)
+    start.set()
+    total = sum(results.get() for _ in children)
+    for child in children:
+        child.join()
+    return total / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration of the stress run and of each config')
+    parser.add_argument('--readers', type=int, default=8, help='reader threads in the stress run')
+    parser.add_argument('--writers', type=int, default=4, help='writer threads in the stress run')
+    parser.add_argument('--configs', default='4x1,1x4,1x16,2x8',
+                        help='processes x threads to compare, comma separated')
+    parser.add_argument('--io-wait-ms', type=float, default=0.0,
+                        help='simulated client/network wait per request (threads overlap it, processes don\'t)')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['ADMIN_PANEL_DB'] = os.path.join(tmp.name, 'admin_panel.db')
+    os.environ['PORTFOLIO_LEGACY_PICKLE'] = '0'
+    sys.path.insert(0, ROOT)
+    import simple_app
+
+    # Keep every file the storage writes inside the scratch directory
+    simple_app.PORTFOLIO_SNAPSHOT_PATH = os.path.join(tmp.name, 'portfolio_items.ndjson')
+    simple_app.WRITE_LEGACY_PICKLE = False
+    simple_app.app.config['PORTFOLIO_FOLDER'] = os.path.join(tmp.name, 'portfolio_images')
+    os.makedirs(simple_app.app.config['PORTFOLIO_FOLDER'], exist_ok=True)
+    image_names = ['stress-a.jpg', 'stress-b.jpg', 'stress-c.jpg']
+    for name in image_names:
+        with open(os.path.join(simple_app.app.config['PORTFOLIO_FOLDER'], name), 'wb') as f:
+            f.write(simple_app.render_placeholder_image((90, 90, 90)))
+    simple_app.IMAGE_GC_GRACE_SECONDS = 0
+
+    db = simple_app.db
+    db.bootstrap()
+    db.add_orders([{'name': f'Customer {i}', 'email': f'c{i}@example.com', 'service_name': random.choice(SERVICES),
+                    'requirements': 'Stress order'} for i in range(200)])
+
+    print(f"Stress run: {args.readers} readers, {args.writers} writers, {args.seconds:.0f}s")
+    problems, reads, writes = stress(simple_app, args.seconds, args.readers, args.writers, image_names)
+    # Collected images are fine; only the reference counts have to agree with the items
+    problems += check_final_state(simple_app)
+    print(f"  {reads} snapshot checks, {writes} writes, {len(problems)} problems")
+    for problem in problems[:20]:
+        print(f"  - {problem}")
+
+    # Make sure the image served in the throughput mix exists
+    with open(os.path.join(simple_app.app.config['PORTFOLIO_FOLDER'], 'stress-a.jpg'), 'wb') as f:
+        f.write(simple_app.render_placeholder_image((90, 90, 90)))
+    db.close()
+
+    print(f"Throughput (read mix, {args.io_wait_ms:g}ms simulated I/O wait per request):")
+    for config in args.configs.split(','):
+        processes, threads = (int(part) for part in config.lower().split('x'))
+        rate = measure_config(processes, threads, args.seconds, args.io_wait_ms / 1000)
+        print(f"  {processes} process(es) x {threads:>2} thread(s): {rate:9.1f} requests/s")
+
+    tmp.cleanup()
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
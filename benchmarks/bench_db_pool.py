@@ -0,0 +1,114 @@
+"""
+Benchmark for the pooled SQLite connection layer in DatabaseStorage.
+
+Replays the queries behind one dashboard page view (three status lists,
+recent orders and contact messages) against a seeded scratch database,
+first with a fresh connection per call (the old behaviour) and then through
+the pooled, tuned per-thread connections, and reports page views per second.
+
+Usage:
+    python benchmarks/bench_db_pool.py --orders 5000 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATUSES = ['pending', 'in_progress', 'completed']
+
+
+def seed_orders(db_path, count):
+    """Fill the scratch database with synthetic orders"""
+    conn = sqlite3.connect(db_path)
+    start = datetime.now() - timedelta(days=365)
+    rows = []
+    for i in range(count):
+        created_at = (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')
+        rows.append((f'Customer {i}', f'customer{i}@example.com', '555-0100',
+                     random.choice(['Printing Press', 'SEO', 'Packages Solutions']),
+                     'Benchmark order', random.choice(STATUSES), created_at))
+    conn.executemany(
+        'INSERT INTO orders (name, email, phone, service_name, requirements, status, created_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.commit()
+    conn.close()
+
+
+def connect_per_call_page_view(db_path):
+    """One dashboard page view the way it worked before pooling"""
+    def fetch(query, params=()):
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return rows
+
+    for status in STATUSES:
+        len(fetch('SELECT * FROM orders WHERE status = ? ORDER BY created_at DESC', (status,)))
+    fetch('SELECT * FROM orders ORDER BY created_at DESC')[:5]
+    fetch('SELECT * FROM contact_messages ORDER BY created_at DESC')[:5]
+
+
+def pooled_page_view(storage):
+    """One dashboard page view through the pooled DatabaseStorage"""
+    for status in STATUSES:
+        len(storage.get_orders(status=status))
+    storage.get_orders()[:5]
+    storage.get_contact_messages()[:5]
+
+
+def measure(name, func, seconds):
+    """Run func repeatedly for the given time and report calls per second"""
+    calls = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        func()
+        calls += 1
+    elapsed = time.perf_counter() - started
+    rate = calls / elapsed
+    print(f"{name:<20} {calls:>8} page views in {elapsed:.2f}s  ->  {rate:,.1f} req/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=5000, help='number of orders to seed')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration of each run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        os.environ['ADMIN_PANEL_DB'] = db_path
+        sys.path.insert(0, ROOT)
+        import simple_app
+        from simple_app import DatabaseStorage
+
+        # Keep every file the storage writes inside the scratch directory
+        simple_app.PORTFOLIO_SNAPSHOT_PATH = os.path.join(tmp, 'portfolio_items.ndjson')
+        simple_app.WRITE_LEGACY_PICKLE = False
+        simple_app.app.config['PORTFOLIO_FOLDER'] = os.path.join(tmp, 'portfolio_images')
+        os.makedirs(simple_app.app.config['PORTFOLIO_FOLDER'], exist_ok=True)
+
+        storage = DatabaseStorage(db_path)
+        storage.bootstrap()
+        seed_orders(db_path, args.orders)
+
+        print(f"Dashboard query mix over {args.orders} orders")
+        before = measure('connect per call', lambda: connect_per_call_page_view(db_path), args.seconds)
+        after = measure('pooled connection', lambda: pooled_page_view(storage), args.seconds)
+        print(f"Speedup: {after / before:.2f}x")
+
+        storage.close()
+
+
+if __name__ == '__main__':
+    main()
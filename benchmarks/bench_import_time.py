@@ -0,0 +1,69 @@
+"""
+Import-time budget check for simple_app.
+
+Runs `python -X importtime -c "import simple_app"` in a fresh interpreter,
+reports the cumulative import time and the slowest imported modules, and
+exits non-zero when the import exceeds the budget or when a module that is
+supposed to load lazily (Pillow, multiprocessing) was imported. Suitable as
+a CI gate.
+
+Usage:
+    python benchmarks/bench_import_time.py --budget-ms 350
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed on rare paths (image generation, uploads), so they must not load at startup
+DEFERRED_MODULES = ('PIL', 'PIL.Image', 'multiprocessing', 'concurrent.futures.process')
+
+
+def measure_import(env):
+    """Return {module: (self_us, cumulative_us)} for a cold import of simple_app"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import simple_app'], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('IMPORT_BUDGET_MS', 350)),
+                        help='maximum cumulative import time of simple_app')
+    parser.add_argument('--top', type=int, default=10, help='number of slowest modules to list')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, ADMIN_PANEL_DB=os.path.join(tmp, 'bench.db'))
+        timings = measure_import(env)
+
+    total_ms = timings['simple_app'][1] / 1000
+    print(f"simple_app cold import: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print("Slowest modules (self time):")
+    for name, (self_us, _) in sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    eager = [name for name in DEFERRED_MODULES if name in timings]
+    if eager:
+        failures.append(f"modules meant to load lazily were imported at startup: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
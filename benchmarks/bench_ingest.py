@@ -0,0 +1,225 @@
+"""
+Benchmark for order ingestion through /api/orders.
+
+Concurrent writer threads submit orders while reader threads keep loading
+the first page of /orders, against a seeded scratch database. Three ways of
+writing are compared:
+
+    direct  every submission commits its own transaction (DatabaseStorage.add_orders)
+    queue   submissions go through the group-committing OrderWriter
+    http    POST /api/orders over HTTP to a local threaded WSGI server
+
+For each it reports sustained inserts per second, submission latency and
+the latency of the concurrent reads. In http mode the readers request
+/orders over HTTP too; without the HTML templates that page answers 500
+after running its query, which still exercises the database.
+
+Usage:
+    python benchmarks/bench_ingest.py --writers 16 --readers 4 --seconds 5
+    python benchmarks/bench_ingest.py --mode queue --batch 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATUSES = ['pending', 'in_progress', 'completed']
+SERVICES = ['Printing Press', 'SEO', 'Packages Solutions']
+
+
+def seed_orders(db_path, count):
+    """Fill the scratch database with synthetic orders"""
+    conn = sqlite3.connect(db_path)
+    start = datetime.now() - timedelta(days=365)
+    conn.executemany(
+        'INSERT INTO orders (name, email, phone, service_name, requirements, status, created_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ((f'Customer {i}', f'customer{i}@example.com', '555-0100', random.choice(SERVICES), 'Benchmark order',
+          random.choice(STATUSES), (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'))
+         for i in range(count)))
+    conn.commit()
+    conn.close()
+
+
+def make_order(i):
+    return {'name': f'App customer {i}', 'email': f'app{i}@example.com', 'phone': '555-0199',
+            'service_name': random.choice(SERVICES), 'requirements': 'Submitted from the Agency App'}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))] * 1000
+
+
+def run(name, submit, read, writers, readers, seconds, batch):
+    """Run writer and reader threads for `seconds` and summarize what they did"""
+    stop = threading.Event()
+    lock = threading.Lock()
+    write_latencies = []
+    read_latencies = []
+    inserted = [0]
+    errors = [0]
+
+    def writer(worker):
+        local = []
+        count = 0
+        i = 0
+        while not stop.is_set():
+            orders = [make_order(f'{worker}-{i + n}') for n in range(batch)]
+            i += batch
+            started = time.perf_counter()
+            try:
+                count += len(submit(orders))
+            except Exception as e:
+                with lock:
+                    errors[0] += 1
+                print(f"{name}: submission failed: {e}")
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            write_latencies.extend(local)
+            inserted[0] += count
+
+    def reader():
+        local = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            read()
+            local.append(time.perf_counter() - started)
+        with lock:
+            read_latencies.extend(local)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'mode': name,
+        'inserts_per_s': round(inserted[0] / elapsed, 1),
+        'write_p50_ms': round(percentile(write_latencies, 50), 2),
+        'write_p99_ms': round(percentile(write_latencies, 99), 2),
+        'reads_per_s': round(len(read_latencies) / elapsed, 1),
+        'read_p50_ms': round(percentile(read_latencies, 50), 2),
+        'read_p99_ms': round(percentile(read_latencies, 99), 2),
+        'read_mean_ms': round(statistics.fmean(read_latencies) * 1000, 2) if read_latencies else 0.0,
+        'errors': errors[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=100000, help='orders to seed before measuring')
+    parser.add_argument('--writers', type=int, default=16, help='concurrent submitting threads')
+    parser.add_argument('--readers', type=int, default=4, help='concurrent threads reading the orders list')
+    parser.add_argument('--batch', type=int, default=1, help='orders per submission')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration of each run')
+    parser.add_argument('--mode', choices=['direct', 'queue', 'http', 'all'], default='all')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_path = os.path.join(tmp.name, 'admin_panel.db')
+    os.environ['ADMIN_PANEL_DB'] = db_path
+    os.environ.setdefault('PORTFOLIO_LEGACY_PICKLE', '0')
+    token = os.environ.setdefault('ORDERS_API_TOKEN', 'bench-token')
+
+    sys.path.insert(0, ROOT)
+    import simple_app
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    # Keep every file the storage writes inside the scratch directory
+    simple_app.PORTFOLIO_SNAPSHOT_PATH = os.path.join(tmp.name, 'portfolio_items.ndjson')
+    simple_app.WRITE_LEGACY_PICKLE = False
+    simple_app.app.config['PORTFOLIO_FOLDER'] = os.path.join(tmp.name, 'portfolio_images')
+    os.makedirs(simple_app.app.config['PORTFOLIO_FOLDER'], exist_ok=True)
+    db = simple_app.db
+    db.bootstrap()
+    seed_orders(db_path, args.orders)
+    print(f"Seeded {args.orders} orders; {args.writers} writers, {args.readers} readers, "
+          f"{args.batch} orders per submission, {args.seconds:.0f}s per mode")
+
+    def read_in_process():
+        db.get_orders(limit=simple_app.ORDERS_PAGE_SIZE + 1)
+
+    results = []
+    modes = ['direct', 'queue', 'http'] if args.mode == 'all' else [args.mode]
+
+    if 'direct' in modes:
+        results.append(run('direct', db.add_orders, read_in_process, args.writers, args.readers, args.seconds,
+                           args.batch))
+
+    if 'queue' in modes:
+        def submit_queued(orders):
+            return simple_app.order_writer.submit(orders).result(timeout=simple_app.ORDER_WRITER_TIMEOUT)
+        results.append(run('queue', submit_queued, read_in_process, args.writers, args.readers, args.seconds,
+                           args.batch))
+
+    if 'http' in modes:
+        server = make_server('127.0.0.1', 0, simple_app.app, threaded=True, request_handler=QuietRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        app = simple_app.app
+        serializer = app.session_interface.get_signing_serializer(app)
+        cookie = f"{app.config['SESSION_COOKIE_NAME']}={serializer.dumps({'user_id': 1})}"
+        connections = threading.local()
+
+        def request(method, path, body=None, headers=None):
+            conn = getattr(connections, 'conn', None)
+            if conn is None:
+                conn = connections.conn = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=60)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (OSError, http.client.HTTPException):
+                connections.conn = None
+                conn.close()
+                raise
+
+        def submit_http(orders):
+            status, body = request('POST', '/api/orders', json.dumps(orders),
+                                   {'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'})
+            if status != 201:
+                raise RuntimeError(f"HTTP {status}: {body[:200]!r}")
+            return json.loads(body)['ids']
+
+        def read_http():
+            request('GET', '/orders', headers={'Cookie': cookie})
+
+        results.append(run('http', submit_http, read_http, args.writers, args.readers, args.seconds, args.batch))
+        server.shutdown()
+
+    print(f"{'mode':<8} {'inserts/s':>10} {'write p50':>10} {'write p99':>10} {'reads/s':>9} {'read p50':>9} "
+          f"{'read p99':>9} {'errors':>6}")
+    for row in results:
+        print(f"{row['mode']:<8} {row['inserts_per_s']:>10.1f} {row['write_p50_ms']:>8.2f}ms "
+              f"{row['write_p99_ms']:>8.2f}ms {row['reads_per_s']:>9.1f} {row['read_p50_ms']:>7.2f}ms "
+              f"{row['read_p99_ms']:>7.2f}ms {row['errors']:>6}")
+
+    db.close()
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+"""
+Route benchmark suite for the admin panel.
+
+Seeds a scratch copy of the database with a configurable volume of orders,
+contact messages and portfolio items, then measures latency percentiles and
+throughput for every route, both in-process through Flask's test client and
+over HTTP against a local threaded WSGI server. Results are written as JSON
+(tagged with the git commit) so runs can be compared between commits.
+
+Usage:
+    python benchmarks/bench_routes.py --orders 100000 --requests 200
+    python benchmarks/bench_routes.py --orders 1000000 --mode server --concurrency 8
+    python benchmarks/bench_routes.py --compare benchmarks/results/<earlier run>.json
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+STATUSES = ['pending', 'in_progress', 'completed']
+SERVICES = ['Printing Press', 'SEO', 'Packages Solutions']
+SEED_BATCH_SIZE = 50000
+
+
+def seed_database(db_path, orders, messages, portfolio_items):
+    """Fill a bootstrapped database with synthetic rows"""
+    conn = sqlite3.connect(db_path)
+    start = datetime.now() - timedelta(days=730)
+    step = timedelta(days=730) / max(orders, 1)
+
+    def order_rows():
+        for i in range(orders):
+            created_at = (start + step * i).strftime('%Y-%m-%d %H:%M:%S')
+            yield (f'Customer {i}', f'customer{i}@example.com', '555-0100', random.choice(SERVICES),
+                   f'Requirements for order {i}: brochure, logo and landing page copy',
+                   random.choice(STATUSES), created_at)
+
+    rows = order_rows()
+    while True:
+        batch = [row for _, row in zip(range(SEED_BATCH_SIZE), rows)]
+        if not batch:
+            break
+        conn.executemany(
+            'INSERT INTO orders (name, email, phone, service_name, requirements, status, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)', batch)
+        conn.commit()
+
+    conn.executemany(
+        'INSERT INTO contact_messages (name, email, subject, message, created_at) VALUES (?, ?, ?, ?, ?)',
+        [(f'Visitor {i}', f'visitor{i}@example.com', 'Pricing question', 'Can you send me a quote?',
+          (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')) for i in range(messages)])
+
+    conn.executemany(
+        'INSERT INTO portfolio_items (title, description, category, image_filename) VALUES (?, ?, ?, ?)',
+        [(f'Item {i}', 'Benchmark portfolio item', SERVICES[i % len(SERVICES)], 'printing_press_brochure.jpg')
+         for i in range(portfolio_items)])
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+
+
+def sample_jpeg():
+    """A small JPEG for upload benchmarks"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (640, 400), (40, 90, 160)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def summarize(route, mode, latencies, errors, elapsed, statuses):
+    """Latency percentiles (ms) and throughput for one route"""
+    latencies = sorted(latencies)
+    ms = [value * 1000 for value in latencies]
+
+    def percentile(p):
+        if not ms:
+            return None
+        return round(ms[min(len(ms) - 1, int(round(p / 100 * (len(ms) - 1))))], 3)
+
+    return {
+        'route': route,
+        'mode': mode,
+        'requests': len(latencies),
+        'errors': errors,
+        'statuses': statuses,
+        'mean_ms': round(statistics.fmean(ms), 3) if ms else None,
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p99_ms': percentile(99),
+        'max_ms': round(ms[-1], 3) if ms else None,
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None
+    }
+
+
+def run_client_benchmark(client, route, requests, prepare=None):
+    """Time requests through the Flask test client; prepare() builds each request outside the timing"""
+    latencies = []
+    statuses = {}
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        method, path, kwargs = prepare() if prepare else ('GET', route, {})
+        before = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        response.get_data()
+        latencies.append(time.perf_counter() - before)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        if response.status_code >= 400:
+            errors += 1
+    return summarize(route, 'test_client', latencies, errors, time.perf_counter() - started, statuses)
+
+
+def run_server_benchmark(port, cookie, route, path, requests, concurrency):
+    """Time GET requests over HTTP from several keep-alive client threads"""
+    latencies = []
+    statuses = {}
+    errors = [0]
+    lock = threading.Lock()
+    per_thread = max(requests // concurrency, 1)
+
+    def worker():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        for _ in range(per_thread):
+            before = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Cookie': cookie})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                status = 'error'
+            elapsed = time.perf_counter() - before
+            with lock:
+                latencies.append(elapsed)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+                if status == 'error' or status >= 400:
+                    errors[0] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(route, f'wsgi_server_c{concurrency}', latencies, errors[0], time.perf_counter() - started,
+                     statuses)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    baseline_rows = {(row['route'], row['mode']): row for row in (baseline or {}).get('results', [])}
+    print(f"{'route':<34} {'mode':<16} {'p50':>9} {'p90':>9} {'p99':>9} {'req/s':>9} {'errors':>6}")
+    for row in results:
+        line = (f"{row['route']:<34} {row['mode']:<16} {row['p50_ms'] or 0:>7.2f}ms {row['p90_ms'] or 0:>7.2f}ms "
+                f"{row['p99_ms'] or 0:>7.2f}ms {row['throughput_rps'] or 0:>9.1f} {row['errors']:>6}")
+        previous = baseline_rows.get((row['route'], row['mode']))
+        if previous and previous.get('p50_ms') and row['p50_ms']:
+            line += f"   p50 {(row['p50_ms'] / previous['p50_ms'] - 1) * 100:+.1f}% vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=10000, help='orders to seed (e.g. 10000, 100000, 1000000)')
+    parser.add_argument('--messages', type=int, default=5000, help='contact messages to seed')
+    parser.add_argument('--portfolio-items', type=int, default=100, help='extra portfolio items to seed')
+    parser.add_argument('--requests', type=int, default=100, help='requests per route')
+    parser.add_argument('--concurrency', type=int, default=4, help='client threads in server mode')
+    parser.add_argument('--mode', choices=['client', 'server', 'both'], default='both')
+    parser.add_argument('--db', help='seed and reuse this database file instead of a temporary one')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/routes-<commit>-<time>.json)')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_path = args.db or os.path.join(tmp.name, 'admin_panel.db')
+    reuse = args.db and os.path.exists(args.db)
+    os.environ['ADMIN_PANEL_DB'] = db_path
+    os.environ.setdefault('PORTFOLIO_LEGACY_PICKLE', '0')
+
+    sys.path.insert(0, ROOT)
+    import simple_app
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    # Keep every file the storage writes inside the scratch directory
+    portfolio_folder = os.path.join(tmp.name, 'portfolio_images')
+    os.makedirs(portfolio_folder, exist_ok=True)
+    simple_app.app.config['PORTFOLIO_FOLDER'] = portfolio_folder
+    simple_app.PORTFOLIO_SNAPSHOT_PATH = os.path.join(tmp.name, 'portfolio_items.ndjson')
+    simple_app.WRITE_LEGACY_PICKLE = False
+    # The portfolio POSTs trigger a sync; run a no-op script instead of the real one
+    simple_app.SYNC_SCRIPT_PATH = os.path.join(tmp.name, 'auto_sync_portfolio.py')
+    with open(simple_app.SYNC_SCRIPT_PATH, 'w') as f:
+        f.write('# No-op stand-in for the portfolio sync script\n')
+
+    print(f"Preparing database {db_path}")
+    simple_app.db.bootstrap()
+    if not reuse:
+        started = time.perf_counter()
+        seed_database(db_path, args.orders, args.messages, args.portfolio_items)
+        print(f"Seeded {args.orders} orders, {args.messages} messages and {args.portfolio_items} portfolio items "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    db = simple_app.db
+    app = simple_app.app
+    order_id = db.get_orders(limit=1)[0]['id'] if args.orders else 1
+    image_name = 'printing_press_brochure.jpg'
+    image_bytes = sample_jpeg()
+    with open(os.path.join(portfolio_folder, image_name), 'wb') as f:
+        f.write(image_bytes)
+
+    get_routes = [
+        ('/dashboard', '/dashboard'),
+        ('/orders', '/orders'),
+        ('/orders?status=pending', '/orders?status=pending'),
+        ('/orders/<id>', f'/orders/{order_id}'),
+        ('/api/check-notifications', '/api/check-notifications'),
+        ('/portfolio', '/portfolio'),
+        ('/uploads/portfolio/<filename>', f'/uploads/portfolio/{image_name}'),
+    ]
+
+    def upload(title):
+        return {'data': {'title': title, 'description': 'Benchmark upload', 'category': random.choice(SERVICES),
+                         'image': (io.BytesIO(image_bytes), 'upload.jpg')},
+                'content_type': 'multipart/form-data'}
+
+    def prepare_add():
+        return 'POST', '/portfolio/add', upload('Added item')
+
+    def prepare_edit():
+        item = db.get_portfolio_items()[0]
+        return 'POST', f"/portfolio/{item['id']}/edit", {
+            'data': {'title': 'Edited item', 'description': 'Benchmark edit', 'category': item['category']}}
+
+    def prepare_delete():
+        item = db.add_portfolio_item('To delete', 'Benchmark delete', random.choice(SERVICES), image_name)
+        return 'POST', f"/portfolio/{item['id']}/delete", {}
+
+    results = []
+
+    if args.mode in ('client', 'both'):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['user_id'] = 1
+            session['username'] = 'admin'
+            session['name'] = 'Administrator'
+
+        for route, path in get_routes:
+            results.append(run_client_benchmark(client, route, args.requests, lambda path=path: ('GET', path, {})))
+        results.append(run_client_benchmark(client, 'POST /portfolio/add', args.requests, prepare_add))
+        results.append(run_client_benchmark(client, 'POST /portfolio/<id>/edit', args.requests, prepare_edit))
+        results.append(run_client_benchmark(client, 'POST /portfolio/<id>/delete', args.requests, prepare_delete))
+
+    if args.mode in ('server', 'both'):
+        server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        serializer = app.session_interface.get_signing_serializer(app)
+        cookie = f"{app.config['SESSION_COOKIE_NAME']}={serializer.dumps({'user_id': 1, 'username': 'admin', 'name': 'Administrator'})}"
+
+        for route, path in get_routes:
+            results.append(run_server_benchmark(server.server_port, cookie, route, path, args.requests,
+                                                args.concurrency))
+        server.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    commit = git_commit()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"routes-{commit or 'unknown'}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'meta': {
+                'commit': commit,
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'orders': args.orders,
+                'messages': args.messages,
+                'portfolio_items': args.portfolio_items,
+                'requests_per_route': args.requests,
+                'concurrency': args.concurrency
+            },
+            'results': results
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+    # Let the variant jobs the uploads queued finish before their folder goes away
+    if simple_app._image_pool is not None:
+        simple_app._image_pool.shutdown(wait=True)
+    db.close()
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
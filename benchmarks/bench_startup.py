@@ -0,0 +1,64 @@
+"""
+Startup benchmark: how long a gunicorn worker takes from import to ready.
+
+Each run starts a fresh interpreter (like a new worker), imports simple_app
+and makes the first database call, and reports the import time and the
+import-to-ready time. The database is initialised once up front with
+`init-db`, as in a deploy, so the runs measure ordinary worker boots.
+
+Usage:
+    python benchmarks/bench_startup.py --workers 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER_BOOT = '''
+import json, time
+started = time.perf_counter()
+import simple_app
+imported = time.perf_counter()
+simple_app.db.get_table_version('orders')
+ready = time.perf_counter()
+print(json.dumps({'import': imported - started, 'ready': ready - started}))
+'''
+
+
+def boot_worker(env):
+    """Boot one worker process and return its timings in seconds"""
+    result = subprocess.run([sys.executable, '-c', WORKER_BOOT], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=10, help='number of worker boots to time')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the database and every file init-db writes inside the scratch directory
+        env = dict(os.environ, ADMIN_PANEL_DB=os.path.join(tmp, 'bench.db'), PORTFOLIO_LEGACY_PICKLE='0',
+                   PORTFOLIO_FOLDER=os.path.join(tmp, 'portfolio_images'),
+                   PORTFOLIO_SNAPSHOT_PATH=os.path.join(tmp, 'portfolio_items.ndjson'))
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'simple_app', 'init-db'], cwd=ROOT, env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+
+        runs = [boot_worker(env) for _ in range(args.workers)]
+
+    for i, run in enumerate(runs, 1):
+        print(f"worker {i:>3}: import {run['import'] * 1000:7.1f} ms   import-to-ready {run['ready'] * 1000:7.1f} ms")
+
+    ready = [run['ready'] * 1000 for run in runs]
+    print(f"import-to-ready: min {min(ready):.1f} ms, median {statistics.median(ready):.1f} ms, max {max(ready):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Check that the hot queries use their indexes.
+
+Seeds a scratch database, runs each hot DatabaseStorage call while tracing
+the SQL it sends, and looks at the EXPLAIN QUERY PLAN of the traced
+statement. A check fails when the plan doesn't use the expected index, or
+falls back to a full scan or a temporary sort where the index should make
+that unnecessary. Exits non-zero if any check fails, so it can run after
+every schema change.
+
+Usage:
+    python benchmarks/check_query_plans.py --orders 20000 --verbose
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ['Printing Press', 'SEO', 'Packages Solutions']
+STATUSES = ['pending', 'in_progress', 'completed']
+
+
+def seed(db, orders, messages):
+    """Fill the scratch database with synthetic orders and contact messages"""
+    start = datetime.now() - timedelta(days=365)
+    conn = db._get_connection()
+    with conn:
+        conn.executemany(
+            'INSERT INTO orders (name, email, phone, service_name, requirements, status, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            ((f'Customer {i}', f'customer{i}@example.com', '555-0100', random.choice(SERVICES),
+              f'Brochure redesign number {i}', random.choice(STATUSES),
+              (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')) for i in range(orders)))
+        conn.executemany(
+            'INSERT INTO contact_messages (name, email, subject, message, created_at) VALUES (?, ?, ?, ?, ?)',
+            ((f'Visitor {i}', f'visitor{i}@example.com', 'Question', 'Do you print flyers?',
+              (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')) for i in range(messages)))
+        # Give the change log some deleted orders and the history a live one builds up over time
+        conn.execute('DELETE FROM orders WHERE id % 100 = 0')
+        conn.execute("UPDATE order_changes SET changed_at = datetime(?, '+' || seq || ' minutes')",
+                     (start.strftime('%Y-%m-%d %H:%M:%S'),))
+    # Statistics matter for the plans, so check them as the workers would see them
+    conn.execute('ANALYZE')
+
+
+def explain(conn, sql):
+    """EXPLAIN QUERY PLAN details for one statement, one string per plan step"""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=20000, help='orders to seed')
+    parser.add_argument('--messages', type=int, default=5000, help='contact messages to seed')
+    parser.add_argument('--verbose', action='store_true', help='print every plan, not just failures')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['ADMIN_PANEL_DB'] = os.path.join(tmp.name, 'admin_panel.db')
+    os.environ['PORTFOLIO_LEGACY_PICKLE'] = '0'
+    sys.path.insert(0, ROOT)
+    import simple_app
+
+    # Keep every file the storage writes inside the scratch directory
+    simple_app.PORTFOLIO_SNAPSHOT_PATH = os.path.join(tmp.name, 'portfolio_items.ndjson')
+    simple_app.WRITE_LEGACY_PICKLE = False
+    simple_app.app.config['PORTFOLIO_FOLDER'] = os.path.join(tmp.name, 'portfolio_images')
+    os.makedirs(simple_app.app.config['PORTFOLIO_FOLDER'], exist_ok=True)
+
+    db = simple_app.db
+    db.bootstrap()
+    seed(db, args.orders, args.messages)
+    conn = db._get_connection()
+    newest = db.get_orders(limit=1)[0]
+    after = (newest['created_at'], newest['id'])
+
+    # (description, call, text identifying the traced statement, expected in the plan, not allowed in the plan)
+    checks = [
+        ('login lookup', lambda: db.get_user('admin', 'admin'),
+         'FROM users', 'sqlite_autoindex_users', 'SCAN'),
+        ('orders page', lambda: db.get_orders(limit=simple_app.ORDERS_PAGE_SIZE + 1),
+         'FROM orders', 'idx_orders_created', 'TEMP B-TREE'),
+        ('orders page after a cursor', lambda: db.get_orders(after=after, limit=simple_app.ORDERS_PAGE_SIZE + 1),
+         'FROM orders', 'idx_orders_created', 'TEMP B-TREE'),
+        ('orders page by status', lambda: db.get_orders(status='pending', limit=simple_app.ORDERS_PAGE_SIZE + 1),
+         'FROM orders', 'idx_orders_status_created', 'TEMP B-TREE'),
+        ('orders page by status after a cursor',
+         lambda: db.get_orders(status='pending', after=after, limit=simple_app.ORDERS_PAGE_SIZE + 1),
+         'FROM orders', 'idx_orders_status_created', 'TEMP B-TREE'),
+        ('order counts by status', db.count_orders_by_status,
+         'GROUP BY status', 'COVERING INDEX idx_orders_status_created', 'TEMP B-TREE'),
+        ('latest contact messages', lambda: db.get_contact_messages(limit=simple_app.DASHBOARD_RECENT_LIMIT),
+         'FROM contact_messages', 'idx_contact_messages_created', 'TEMP B-TREE'),
+        ('portfolio category lookup',
+         lambda: db.add_portfolio_item('Plan check', 'Added by the plan check', 'SEO', 'seo_plan_check.jpg'),
+         'LOWER(category)', 'idx_portfolio_items_category', 'SCAN'),
+        ('order ETag seq', lambda: db.get_order_change_seq(newest['id']),
+         'FROM order_changes', 'idx_order_changes_order', 'SCAN'),
+        ('order change feed', lambda: db.get_order_changes(args.orders - 100),
+         'FROM order_changes', 'INTEGER PRIMARY KEY', 'TEMP B-TREE'),
+        ('dashboard trends', lambda: db.get_order_trends(30),
+         'FROM order_stats_daily', 'USING PRIMARY KEY', 'SCAN'),
+        ('order search', lambda: db.search('brochure 12'),
+         'MATCH', 'VIRTUAL TABLE INDEX', None),
+        ('change log compaction', db.compact_order_changes,
+         'seq < (SELECT MAX(later.seq)', 'idx_order_changes_changed', 'SCAN'),
+        ('change log expired deletions', db.compact_order_changes,
+         "op = 'delete' AND changed_at", 'idx_order_changes_deleted', 'SCAN'),
+    ]
+
+    failures = 0
+    for description, call, marker, expected, forbidden in checks:
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+
+        # Trigger bodies are traced as comments; only the statement itself is checked
+        matching = [sql for sql in statements
+                    if sql.lstrip().upper().startswith(('SELECT', 'DELETE')) and marker in sql]
+        if not matching:
+            print(f"FAIL {description}: no traced statement contains {marker!r}")
+            failures += 1
+            continue
+
+        plan = explain(conn, matching[0])
+        problems = []
+        if not any(expected in step for step in plan):
+            problems.append(f"expected {expected!r}")
+        if forbidden and any(step.startswith(forbidden) or f' {forbidden}' in step for step in plan):
+            problems.append(f"found {forbidden!r}")
+
+        if problems:
+            failures += 1
+            print(f"FAIL {description}: {', '.join(problems)}")
+        else:
+            print(f"ok   {description}")
+        if problems or args.verbose:
+            print(f"     {' '.join(matching[0].split())}")
+            for step in plan:
+                print(f"       {step}")
+
+    db.close()
+    tmp.cleanup()
+    print(f"{len(checks) - failures} of {len(checks)} hot queries use their indexes")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
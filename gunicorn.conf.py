@@ -0,0 +1,42 @@
+"""
+Gunicorn configuration for the admin panel
+
+Threaded workers let long-poll and Server-Sent Events notification requests
+sit idle without tying up a whole worker process each. Set
+GUNICORN_WORKER_CLASS=gevent (after `pip install gevent`) to hold thousands of
+idle connections on greenlets instead of threads.
+
+Workers write their Prometheus metrics to PROMETHEUS_MULTIPROC_DIR so that
+/metrics reports totals across all of them.
+"""
+
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+# gthread: requests served concurrently per worker; gevent: open connections per worker
+threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000'))
+
+# Held notification requests keep the worker loop alive, so this only reaps hung workers
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+keepalive = 75
+
+# Shared by all workers for /metrics; must be set before the app (and prometheus_client) is imported
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'admin-panel-metrics'))
+
+
+def on_starting(server):
+    # Files left over from a previous master would be added to the new totals
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
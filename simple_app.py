@@ -1,26 +1,194 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, g, make_response
 import os
+import io
 import json
-import uuid
-import shutil
-import pickle
-from datetime import datetime
-from functools import wraps
-from werkzeug.utils import secure_filename
-from PIL import Image, ImageDraw, ImageFont
+import csv
+import hashlib
+import hmac
+import mimetypes
+import queue
+import re
+import tempfile
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from jinja2 import FileSystemBytecodeCache
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+                               multiprocess)
+from werkzeug.http import is_resource_modified
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
 
 app = Flask(__name__)
 app.secret_key = 'agency_admin_secret_key'  # Change this to a secure random key in production
 
 # File upload configuration
-# Use a single, simple shared directory for all portfolio images
-PORTFOLIO_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'portfolio_images')
+# Use a single, simple shared directory for all portfolio images (PORTFOLIO_FOLDER overrides it)
+PORTFOLIO_FOLDER = os.environ.get('PORTFOLIO_FOLDER') or \
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'portfolio_images')
 ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 
 app.config['PORTFOLIO_FOLDER'] = PORTFOLIO_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
+# SQLite tuning for the pooled per-thread connections
+SQLITE_BUSY_TIMEOUT = 5.0  # Seconds to wait for a lock held by another writer
+SQLITE_STATEMENT_CACHE_SIZE = 256  # Prepared statements kept per connection
+SQLITE_MMAP_SIZE = 64 * 1024 * 1024  # 64MB of memory-mapped reads
+
+# Number of the newest DatabaseStorage._migration_<N>; applied versions are stored in PRAGMA user_version
+SCHEMA_VERSION = 7
+
+# Periodic upkeep on a background thread in each process: order change log compaction and
+# query planner statistics
+DATABASE_MAINTENANCE_INTERVAL = 3600  # Seconds between runs
+SQLITE_ANALYSIS_LIMIT = 400  # Rows sampled per index when PRAGMA optimize re-analyzes a table
+
+# Order statuses shown on the dashboard
+ORDER_STATUSES = ('pending', 'in_progress', 'completed')
+
+# Keyset pagination for the orders list
+ORDERS_PAGE_SIZE = 50
+ORDERS_MAX_PAGE_SIZE = 200
+
+# Dashboard order trends, read from the trigger-maintained order_stats_daily rollup
+TREND_DEFAULT_DAYS = 30
+TREND_MAX_DAYS = 365
+
+# Order change feed (/api/orders/changes)
+ORDER_CHANGES_PAGE_SIZE = 100
+ORDER_CHANGES_MAX_PAGE_SIZE = 1000
+ORDER_CHANGES_RETENTION_DAYS = 30  # Deletions older than this are forgotten; clients further behind must resync
+ORDER_CHANGES_COMPACT_AFTER = 24 * 3600  # Seconds before superseded entries for the same order are removed
+
+# Order ingestion API (/api/orders) for the Agency App
+ORDERS_API_TOKEN = os.environ.get('ORDERS_API_TOKEN')  # Bearer token for API clients; admins can use their session
+ORDERS_API_MAX_BATCH = 500  # Orders accepted per request
+ORDER_FIELDS = ('name', 'email', 'phone', 'service_name', 'requirements')
+ORDER_REQUIRED_FIELDS = ('name', 'email', 'service_name', 'requirements')
+ORDER_FIELD_MAX_LENGTH = 10000
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+ORDER_WRITER_MAX_BATCH = 2000  # Orders group-committed per transaction by the writer thread
+ORDER_WRITER_TIMEOUT = 30.0  # Seconds a request waits for its orders to be committed
+
+# Order exports stream this many rows per fetch, so memory stays flat however many orders match
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+# Columns indexed for full-text search (SQLite FTS5), per table
+SEARCH_COLUMNS = {
+    'orders': ('name', 'email', 'service_name', 'requirements'),
+    'contact_messages': ('subject', 'message')
+}
+
+# Push notifications for new orders (long-poll and Server-Sent Events)
+NOTIFICATIONS_POLL_INTERVAL = 1.0  # Seconds between change-counter checks while a client waits
+NOTIFICATIONS_MAX_WAIT = 25.0  # Longest a long-poll request is held open
+NOTIFICATIONS_HEARTBEAT = 15.0  # Keep-alive comment interval on idle event streams
+NOTIFICATIONS_STREAM_TIMEOUT = 300.0  # Streams end after this; EventSource reconnects on its own
+
+# Responsive variants generated for every uploaded image, named <name>__<variant>.<ext>
+IMAGE_VARIANT_SIZES = {'thumb': 320, 'medium': 800, 'full': 1920}  # Longest side in pixels
+IMAGE_VARIANT_FORMATS = {'jpg': 'JPEG', 'webp': 'WEBP'}
+IMAGE_VARIANT_QUALITY = 82
+IMAGE_PROCESS_WORKERS = 2  # Processes resizing images off the request threads
+
+# Content-addressed upload storage
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes copied (and hashed) per read while streaming an upload
+IMAGE_GC_GRACE_SECONDS = 600  # Unreferenced images this recent are not garbage collected yet
+
+# Placeholder served (never written to disk) for image names that don't exist, by category
+PLACEHOLDER_COLORS = {
+    'printing': (200, 50, 50),  # Red for Printing Press
+    'seo': (50, 150, 50),  # Green for SEO
+    'packages': (50, 50, 200)  # Blue for Packages
+}
+PLACEHOLDER_MAX_AGE = 60  # Short, so a real upload under the same name shows up soon
+
+# HTTP caching for /uploads/portfolio
+# Uploads are named by content hash (older ones carry a uuid4().hex prefix), so they never change
+IMMUTABLE_IMAGE_PATTERN = re.compile(r'^(?:[0-9a-f]{64}[._]|[0-9a-f]{32}_)')
+CONTENT_ADDRESSED_IMAGE_PATTERN = re.compile(r'^[0-9a-f]{64}[._]')  # Uploads and their variants
+IMMUTABLE_IMAGE_MAX_AGE = 365 * 24 * 3600
+IMAGE_MAX_AGE = 300  # Other files (the sample images) are revalidated after five minutes
+IMAGE_STAT_CACHE_TTL = 30.0  # Seconds a cached os.stat result is trusted
+IMAGE_STAT_CACHE_SIZE = 1024
+
+# Portfolio sync script shared with the Agency App. Each worker runs it in a long-lived
+# helper process as if by `python auto_sync_portfolio.py` (see run_sync_script)
+SYNC_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "auto_sync_portfolio.py")
+SYNC_DEBOUNCE_SECONDS = 2.0  # Quiet period after the last edit before a sync runs
+SYNC_SCRIPT_TIMEOUT = 300.0  # Seconds before a hung sync is killed and its helper replaced
+
+# Portfolio snapshot for the sync script: an NDJSON header line followed by one item per line
+PORTFOLIO_SNAPSHOT_PATH = os.environ.get('PORTFOLIO_SNAPSHOT_PATH') or \
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "portfolio_items.ndjson")
+PORTFOLIO_SNAPSHOT_FORMAT_VERSION = 1
+
+# The pickle is only kept for sync scripts that haven't moved to the snapshot yet
+PORTFOLIO_PICKLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "portfolio_items.pickle")
+WRITE_LEGACY_PICKLE = os.environ.get('PORTFOLIO_LEGACY_PICKLE', '1') == '1'
+
+# Rendered /dashboard and /portfolio pages, reused until a table they show changes
+PAGE_CACHE_MAX_ENTRIES = 128
+PAGE_CACHE_MAX_SIZE = 8 * 1024 * 1024  # Total characters of cached HTML per worker
+DASHBOARD_RECENT_LIMIT = 5  # Recent orders and contact messages shown on the dashboard
+
+def code_release():
+    """Fingerprint of this module, the templates and static files, from their sizes and mtimes"""
+    digest = hashlib.sha256()
+    paths = [os.path.abspath(__file__)]
+    for folder in (app.template_folder, app.static_folder):
+        folder = os.path.join(app.root_path, folder) if folder else None
+        for root, dirs, files in os.walk(folder) if folder else ():
+            dirs.sort()
+            paths.extend(os.path.join(root, name) for name in sorted(files))
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.relpath(path, app.root_path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+# Conditional GET for pages and JSON: weak ETags built from table change counters, so a
+# revalidation is answered with a 304 before any rows are read or templates rendered.
+# The release is part of every tag so a deploy with new code, templates or static files
+# invalidates them. Set APP_RELEASE (e.g. to the commit) to keep tags stable across hosts
+ETAG_RELEASE = os.environ.get('APP_RELEASE') or code_release()
+
+# Compiled templates are cached on disk so new workers don't recompile them; by default
+# in a per-user directory under the system temp dir
+JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+
+# Prometheus metrics at /metrics; set PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does) to sum all workers
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # When set, scrapers must send "Authorization: Bearer <token>"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SQL_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+TASK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+REQUEST_DURATION = Histogram('admin_request_duration_seconds', 'Time spent handling a request',
+                             ['method', 'endpoint', 'status'], buckets=LATENCY_BUCKETS)
+REQUEST_SQL_QUERIES = Histogram('admin_request_sql_queries', 'SQL statements executed per request',
+                                ['endpoint'], buckets=SQL_QUERY_BUCKETS)
+REQUEST_SQL_DURATION = Histogram('admin_request_sql_seconds', 'Time spent executing SQL per request',
+                                 ['endpoint'], buckets=LATENCY_BUCKETS)
+SYNC_DURATION = Histogram('admin_portfolio_sync_duration_seconds', 'Portfolio sync script run time',
+                          ['result'], buckets=TASK_BUCKETS)
+IMAGE_VARIANTS_DURATION = Histogram('admin_image_variants_duration_seconds',
+                                    'Time to resize and encode the variants of one uploaded image',
+                                    buckets=TASK_BUCKETS)
+PAGE_CACHE_REQUESTS = Counter('admin_page_cache_requests', 'Rendered page cache lookups', ['page', 'result'])
+
+if JINJA_BYTECODE_CACHE_DIR:
+    os.makedirs(JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+# Set before the Jinja environment is created, which Flask does on first render
+app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(JINJA_BYTECODE_CACHE_DIR)}
+
 # Create portfolio directory if it doesn't exist
 os.makedirs(PORTFOLIO_FOLDER, exist_ok=True)
 
@@ -30,55 +198,730 @@ print(f"[ADMIN] Using portfolio folder: {PORTFOLIO_FOLDER}")
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def run_sync_script():
-    """Run the auto_sync_portfolio.py script to sync portfolio items to the app"""
-    import os
-    import sys
-    import subprocess
-
-    # Get the path to the auto_sync_portfolio.py script
-    sync_script_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "auto_sync_portfolio.py")
-
-    if os.path.exists(sync_script_path):
-        # Run the sync script
-        result = subprocess.run([sys.executable, sync_script_path],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True)
-        print(f"Running portfolio sync script: {sync_script_path}")
-        print(f"Sync script output: {result.stdout}")
-        if result.stderr:
-            print(f"Sync script error: {result.stderr}")
-        return True
+@lru_cache(maxsize=16)
+def render_placeholder_image(color, emblem=False):
+    """Draw a 400x250 placeholder in the given colour and return it encoded as JPEG bytes
+
+    Results are cached, so each colour is only drawn once per process.
+    """
+    # Pillow is only needed here and in the image pool, so it isn't imported at startup
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGB', (400, 250), color=color)
+    draw = ImageDraw.Draw(img)
+
+    # Add a white border
+    draw.rectangle([10, 10, 390, 240], outline=(255, 255, 255), width=5)
+
+    if emblem:
+        # Draw a simple design element (circle)
+        center_x, center_y = 200, 125
+        radius = 50
+        draw.ellipse((center_x - radius, center_y - radius,
+                     center_x + radius, center_y + radius),
+                     outline=(255, 255, 255), width=3)
+
+        # Draw a smaller inner circle with the service color but brighter
+        inner_radius = 30
+        r, g, b = color
+        brighter_color = (min(r + 50, 255), min(g + 50, 255), min(b + 50, 255))
+        draw.ellipse((center_x - inner_radius, center_y - inner_radius,
+                     center_x + inner_radius, center_y + inner_radius),
+                     fill=brighter_color, outline=(255, 255, 255), width=1)
+
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+def placeholder_category(filename):
+    """Pick the placeholder category for an image name"""
+    if 'printing' in filename.lower():
+        return 'printing'
+    elif 'seo' in filename.lower():
+        return 'seo'
+    return 'packages'
+
+def variant_filename(filename, variant, ext):
+    """Name of a resized variant of an uploaded image"""
+    return f"{os.path.splitext(filename)[0]}__{variant}.{ext}"
+
+def generate_image_variants(image_path):
+    """Write the thumb/medium/full JPEG and WebP variants next to an uploaded image
+
+    Runs in the image process pool. EXIF orientation is applied so variants
+    display upright, and every variant is written atomically. Returns the
+    created filenames and the seconds spent on them.
+    """
+    from PIL import Image, ImageOps
+
+    started = time.perf_counter()
+    created = []
+    with Image.open(image_path) as source:
+        img = ImageOps.exif_transpose(source)
+
+        # Flatten transparency onto white, JPEG has no alpha channel
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        for variant, max_size in IMAGE_VARIANT_SIZES.items():
+            resized = img.copy()
+            resized.thumbnail((max_size, max_size), Image.LANCZOS)
+
+            for ext, image_format in IMAGE_VARIANT_FORMATS.items():
+                buffer = io.BytesIO()
+                resized.save(buffer, image_format, quality=IMAGE_VARIANT_QUALITY, optimize=True)
+                filename = variant_filename(os.path.basename(image_path), variant, ext)
+                write_file_atomically(os.path.join(os.path.dirname(image_path), filename), buffer.getvalue())
+                created.append(filename)
+
+    return created, time.perf_counter() - started
+
+_image_pool = None
+_image_pool_pid = None
+_image_variants_pending = set()  # Images this worker is generating variants for
+_image_variants_lock = threading.Lock()
+
+def schedule_image_variants(image_path):
+    """Generate an uploaded image's variants in the process pool without waiting for them
+
+    Returns the future, or None if this worker already has a job for the image.
+    """
+    global _image_pool, _image_pool_pid
+
+    # Pools don't survive a fork, so each gunicorn worker creates its own on first upload
+    if _image_pool is None or _image_pool_pid != os.getpid():
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # spawn, not fork: the worker has other threads that may hold locks, and
+        # generate_image_variants is a module-level function the children import
+        _image_pool = ProcessPoolExecutor(max_workers=IMAGE_PROCESS_WORKERS,
+                                          mp_context=multiprocessing.get_context('spawn'))
+        _image_pool_pid = os.getpid()
+
+    # Re-uploads before the first job finishes would otherwise queue the same work again
+    with _image_variants_lock:
+        if image_path in _image_variants_pending:
+            return None
+        _image_variants_pending.add(image_path)
+
+    def done(future):
+        with _image_variants_lock:
+            _image_variants_pending.discard(image_path)
+        try:
+            created, elapsed = future.result()
+            # Timed inside the pool process, so this excludes time spent queued
+            IMAGE_VARIANTS_DURATION.observe(elapsed)
+            # Drop cached "missing" results so the new variants are served right away
+            for filename in created:
+                forget_portfolio_file_stat(os.path.join(os.path.dirname(image_path), filename))
+            print(f"Created image variants: {', '.join(created)}")
+        except Exception as e:
+            print(f"Error creating image variants for {image_path}: {e}")
+
+    try:
+        future = _image_pool.submit(generate_image_variants, image_path)
+    except Exception:
+        with _image_variants_lock:
+            _image_variants_pending.discard(image_path)
+        raise
+    future.add_done_callback(done)
+    return future
+
+_image_stat_cache = OrderedDict()
+_image_stat_lock = threading.Lock()
+
+def stat_portfolio_file(path):
+    """os.stat() a portfolio file through a small LRU cache, returning None if it doesn't exist"""
+    now = time.monotonic()
+    with _image_stat_lock:
+        entry = _image_stat_cache.get(path)
+        if entry is not None and entry[0] > now:
+            _image_stat_cache.move_to_end(path)
+            return entry[1]
+
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        stat = None
+
+    with _image_stat_lock:
+        _image_stat_cache[path] = (now + IMAGE_STAT_CACHE_TTL, stat)
+        _image_stat_cache.move_to_end(path)
+        while len(_image_stat_cache) > IMAGE_STAT_CACHE_SIZE:
+            _image_stat_cache.popitem(last=False)
+    return stat
+
+def forget_portfolio_file_stat(path):
+    """Drop a path from the stat cache after it was created or removed"""
+    with _image_stat_lock:
+        _image_stat_cache.pop(path, None)
+
+def send_portfolio_file(filename, immutable=True):
+    """Serve a file from the portfolio folder with caching headers, or return None if it doesn't exist
+
+    Responses carry a strong ETag and Last-Modified, answer conditional
+    requests with 304 before the file is opened, and support Range requests.
+    Content-addressed and uuid-named uploads are marked immutable for a year,
+    unless immutable=False because the file stands in for another one.
+    """
+    path = safe_join(app.config['PORTFOLIO_FOLDER'], filename)
+    if path is None:
+        return None
+
+    stat = stat_portfolio_file(path)
+    if stat is None:
+        return None
+
+    # A content-addressed name already identifies the bytes, and stays valid when a
+    # re-upload refreshes the file's mtime; other files fall back to size and mtime
+    if CONTENT_ADDRESSED_IMAGE_PATTERN.match(filename):
+        etag = filename
     else:
-        print(f"Sync script not found: {sync_script_path}")
+        etag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    last_modified = datetime.fromtimestamp(int(stat.st_mtime), timezone.utc)
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = app.response_class(status=304)
+    else:
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            # Removed since it was cached
+            forget_portfolio_file_stat(path)
+            return None
+
+        response = app.response_class(wrap_file(request.environ, file),
+                                      mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                                      direct_passthrough=True)
+        response.content_length = stat.st_size
+
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    if immutable and IMMUTABLE_IMAGE_PATTERN.match(filename):
+        response.cache_control.max_age = IMMUTABLE_IMAGE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = IMAGE_MAX_AGE
+
+    if response.status_code == 200:
+        response.accept_ranges = 'bytes'
+        response = response.make_conditional(request.environ, accept_ranges=True, complete_length=stat.st_size)
+    return response
+
+def store_uploaded_image(image_file):
+    """Stream an upload into the portfolio folder under the SHA-256 of its content
+
+    The file is copied in chunks to a temporary file while it is hashed, then
+    renamed to <sha256>.<ext>. Identical re-uploads reuse the existing file.
+    Returns (filename, is_new).
+    """
+    folder = app.config['PORTFOLIO_FOLDER']
+    # The name itself isn't kept, and allowed_file() has already checked this extension;
+    # secure_filename() would strip names like "тест.jpg" down to just "jpg"
+    ext = image_file.filename.rsplit('.', 1)[1].lower()
+    digest = hashlib.sha256()
+
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.upload.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), SHARED_FILE_MODE)
+            while True:
+                chunk = image_file.stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+
+        filename = f"{digest.hexdigest()}.{ext}"
+        path = os.path.join(folder, filename)
+
+        # Held while deciding so garbage collection can't remove the file in between, see
+        # DatabaseStorage.collect_unreferenced_images
+        with db.image_files_locked():
+            if os.path.exists(path):
+                # Same content is already stored; refresh its mtime so garbage collection leaves it alone
+                os.remove(tmp_path)
+                os.utime(path)
+                return filename, False
+
+            os.replace(tmp_path, path)
+        forget_portfolio_file_stat(path)
+        return filename, True
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def image_variants_missing(image_path):
+    """Whether any resized variant of an image is missing from its directory"""
+    folder, filename = os.path.split(image_path)
+    return any(not os.path.exists(os.path.join(folder, variant_filename(filename, variant, ext)))
+               for variant in IMAGE_VARIANT_SIZES for ext in IMAGE_VARIANT_FORMATS)
+
+def remove_image_variants(filename):
+    """Delete the resized variants of an image from the shared directory"""
+    for variant in IMAGE_VARIANT_SIZES:
+        for ext in IMAGE_VARIANT_FORMATS:
+            path = os.path.join(app.config['PORTFOLIO_FOLDER'], variant_filename(filename, variant, ext))
+            if os.path.exists(path):
+                os.remove(path)
+
+def _sync_helper_main(conn):
+    """Body of the sync helper process: run the sync script each time the worker sends its path
+
+    Each run looks like `python auto_sync_portfolio.py`: the script runs as
+    __main__ with its own directory first on sys.path and only its path in
+    sys.argv. Modules it imported are dropped afterwards so the next run
+    starts clean. Every run answers with (ok, error message).
+    """
+    import runpy
+    import sys
+
+    baseline_modules = set(sys.modules)
+    baseline_path = list(sys.path)
+    while True:
+        try:
+            path = conn.recv()
+        except EOFError:
+            return
+
+        sys.argv = [path]
+        sys.path[:] = [os.path.dirname(os.path.abspath(path))] + baseline_path
+        try:
+            runpy.run_path(path, run_name='__main__')
+            result = (True, None)
+        except SystemExit as e:
+            result = (True, None) if e.code in (None, 0) else (False, f"Sync script exited with status {e.code}")
+        except Exception as e:
+            result = (False, f"{type(e).__name__}: {e}")
+        finally:
+            for name in set(sys.modules) - baseline_modules:
+                del sys.modules[name]
+            sys.path[:] = baseline_path
+        conn.send(result)
+
+def run_sync_script():
+    """Run the auto_sync_portfolio.py script to sync portfolio items to the app
+
+    The script runs in a helper process that each worker starts on first use
+    and keeps, so syncs skip interpreter startup while a crash or hang in the
+    script can't take the worker down. A helper that dies or overruns
+    SYNC_SCRIPT_TIMEOUT is replaced on the next sync.
+    """
+    global _sync_helper
+
+    if not os.path.exists(SYNC_SCRIPT_PATH):
+        print(f"Sync script not found: {SYNC_SCRIPT_PATH}")
         return False
 
+    # Helpers belong to the process that started them, so each gunicorn worker has its own
+    if _sync_helper is None or _sync_helper[2] != os.getpid() or not _sync_helper[0].is_alive():
+        import multiprocessing
+
+        # spawn, not fork: the worker has other threads that may hold locks
+        context = multiprocessing.get_context('spawn')
+        conn, child_conn = context.Pipe()
+        process = context.Process(target=_sync_helper_main, args=(child_conn,), name='portfolio-sync', daemon=True)
+        process.start()
+        child_conn.close()
+        _sync_helper = (process, conn, os.getpid())
+
+    process, conn, _ = _sync_helper
+    print(f"Running portfolio sync script: {SYNC_SCRIPT_PATH}")
+    try:
+        conn.send(SYNC_SCRIPT_PATH)
+        if not conn.poll(SYNC_SCRIPT_TIMEOUT):
+            _sync_helper = None
+            process.kill()
+            process.join()
+            raise RuntimeError(f"Sync script timed out after {SYNC_SCRIPT_TIMEOUT:g}s")
+        ok, error = conn.recv()
+    except (EOFError, OSError):
+        _sync_helper = None
+        process.join()
+        raise RuntimeError(f"Sync helper exited unexpectedly with status {process.exitcode}")
+
+    if not ok:
+        raise RuntimeError(error)
+    return True
+
+_sync_helper = None  # (process, pipe, pid of the worker that started it)
+
+class PortfolioSyncWorker:
+    """Background thread that runs the portfolio sync after edits settle
+
+    Requests made while a sync is waiting or running are coalesced, so a
+    burst of admin edits results in a single sync once the burst is quiet
+    for SYNC_DEBOUNCE_SECONDS.
+    """
+
+    def __init__(self, debounce=SYNC_DEBOUNCE_SECONDS):
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._last_request = None
+        self._status = {
+            'pending': False,
+            'running': False,
+            'requests': 0,
+            'runs': 0,
+            'last_run': None,
+            'last_duration': None,
+            'last_result': None,
+            'last_error': None
+        }
+
+    def request_sync(self):
+        """Schedule a sync and return immediately"""
+        with self._lock:
+            self._last_request = time.monotonic()
+            self._status['pending'] = True
+            self._status['requests'] += 1
+
+            # Threads don't survive a fork, so each gunicorn worker starts its own
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._wakeup = threading.Event()
+                self._thread = threading.Thread(target=self._run, name='portfolio-sync', daemon=True)
+                self._thread.start()
+
+            self._wakeup.set()
+
+    def status(self):
+        """Get a copy of the sync status (last run, duration, pending)"""
+        with self._lock:
+            return dict(self._status)
+
+    def _run(self):
+        wakeup = self._wakeup
+        while True:
+            wakeup.wait()
+
+            # Debounce: wait until no new request has arrived for the debounce period
+            while True:
+                with self._lock:
+                    quiet_for = time.monotonic() - self._last_request
+                if quiet_for >= self.debounce:
+                    break
+                time.sleep(self.debounce - quiet_for)
+
+            with self._lock:
+                wakeup.clear()
+                self._status['pending'] = False
+                self._status['running'] = True
+
+            started = time.monotonic()
+            error = None
+            result = None
+            try:
+                result = run_sync_script()
+            except Exception as e:
+                error = str(e)
+                print(f"Error running portfolio sync script: {e}")
+            duration = time.monotonic() - started
+            SYNC_DURATION.labels('error' if error else 'ok' if result else 'missing').observe(duration)
+
+            with self._lock:
+                self._status['running'] = False
+                self._status['runs'] += 1
+                self._status['last_run'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self._status['last_duration'] = round(duration, 3)
+                self._status['last_result'] = result
+                self._status['last_error'] = error
+
+# mkstemp creates files readable only by their owner; files shared with the Agency App and
+# the sync script get the permissions open() would give them instead. Read once at import,
+# before any threads, because the umask can only be read by setting it
+_umask = os.umask(0o022)
+os.umask(_umask)
+SHARED_FILE_MODE = 0o666 & ~_umask
+
+def write_file_atomically(path, data):
+    """Write bytes to a temporary file next to path, then rename it over path
+
+    Readers see either the old or the new file, never a partly written one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), SHARED_FILE_MODE)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_portfolio_snapshot_header(path):
+    """Read only the header line of a portfolio snapshot, or None if missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+def iter_portfolio_snapshot(path):
+    """Yield the header and then each portfolio item from a snapshot file, one line at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('format') != 'portfolio_items' or header.get('format_version', 0) > PORTFOLIO_SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported portfolio snapshot: {header}")
+        yield header
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# Portfolio items as loaded at one table version, indexed by id and by lowercased category.
+# Snapshots are read-only (tuples and mapping proxies) and replaced whole, never modified,
+# so request threads can share them without locks
+PortfolioSnapshot = namedtuple('PortfolioSnapshot', ['version', 'items', 'by_id', 'by_category'])
+
+# Per-thread SQL accounting for the request being served; reset by before_request
+_sql_stats = threading.local()
+
+def reset_sql_stats():
+    _sql_stats.queries = 0
+    _sql_stats.seconds = 0.0
+
+def get_sql_stats():
+    """Statements executed and seconds spent in SQLite by this thread since the last reset"""
+    return getattr(_sql_stats, 'queries', 0), getattr(_sql_stats, 'seconds', 0.0)
+
+def record_sql(elapsed):
+    _sql_stats.queries = getattr(_sql_stats, 'queries', 0) + 1
+    _sql_stats.seconds = getattr(_sql_stats, 'seconds', 0.0) + elapsed
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that counts and times every statement it executes"""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_sql(time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_sql(time.perf_counter() - started)
+
+    def executescript(self, sql_script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            record_sql(time.perf_counter() - started)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, and execute() shortcuts, go through InstrumentedCursor"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # The C shortcuts skip Cursor.execute, so route them through an instrumented cursor
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+def portfolio_writer(method):
+    """Run a DatabaseStorage portfolio mutation under the storage's writer lock
+
+    SQLite already serializes the transactions; the lock also keeps the image
+    cleanup, cache reload and snapshot write that follow each one in order,
+    so a slower thread can't write an older snapshot file over a newer one.
+    """
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._portfolio_write_lock:
+            return method(self, *args, **kwargs)
+    return locked
+
 # Database storage with SQLite
 class DatabaseStorage:
-    def __init__(self):
-        self.db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'admin_panel.db')
-        self._create_tables()
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.environ.get('ADMIN_PANEL_DB') or \
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'admin_panel.db')
+
+        # One pooled connection per thread (and per worker process)
+        self._local = threading.local()
+
+        # Cached (orders version, per-status counts) for the dashboard and notifications
+        self._order_counts = None
+
+        # Portfolio items, cached in memory and reloaded whenever the table version moves
+        self._portfolio = None
+        self._portfolio_reload_lock = threading.RLock()
+        self._portfolio_write_lock = threading.RLock()
+
+        # Background maintenance thread; see start_maintenance()
+        self._maintenance_lock = threading.Lock()
+        self._maintenance_thread = None
+        self._maintenance_pid = None
+
+        # Nothing touches the database until first use; see bootstrap()
+        self._ready = False
+        self._ready_lock = threading.RLock()
+
+    def bootstrap(self):
+        """Migrate the schema, seed data and sample images, and write the sync snapshot
+
+        Safe to run repeatedly. `flask --app simple_app init-db` runs it once
+        at deploy time; otherwise the first worker to use the database does.
+        """
+        self.migrate()
 
         # Initialize users if needed
         self._init_users()
 
-        # Portfolio items (still in memory for simplicity)
-        self.portfolio_items = []
+        # Load portfolio items, seeding the defaults into an empty table
         self._load_portfolio_items()
 
         # Create sample portfolio images
         self._create_sample_portfolio_images()
 
-        # Save portfolio items to pickle file for sync script
-        self._save_portfolio_items_to_pickle()
+        # Save the portfolio snapshot for the sync script
+        self._save_portfolio_snapshot()
 
-    def _create_tables(self):
-        """Create the necessary tables if they don't exist"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Refresh planner statistics for whatever the migrations and seeding changed
+        self.optimize()
+
+    def _ensure_ready(self, conn):
+        """Bootstrap the database on first use if init-db hasn't been run against it"""
+        with self._ready_lock:
+            if self._ready:
+                return
+
+            if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                print(f"Database not initialized, bootstrapping {self.db_path}")
+                self.bootstrap()
+
+            self._ready = True
+
+    def _get_connection(self):
+        """Return this thread's pooled connection, opening and tuning it on first use"""
+        conn = getattr(self._local, 'conn', None)
+
+        # Connections must never cross a fork, so gunicorn workers each open their own
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.db_path,
+                               timeout=SQLITE_BUSY_TIMEOUT,
+                               cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+                               factory=InstrumentedConnection)
+        conn.row_factory = sqlite3.Row
+
+        # WAL lets readers and the single writer proceed without blocking each other
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}')
+        conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
 
+        # One cheap check per process; threads arriving meanwhile wait for the bootstrap
+        if not self._ready:
+            self._ensure_ready(conn)
+        return conn
+
+    def _fetch_all(self, query, params=()):
+        """Run a read query on the pooled connection and return the rows as dicts"""
+        cursor = self._get_connection().execute(query, params)
+        try:
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def _fetch_one(self, query, params=()):
+        """Run a read query on the pooled connection and return the first row as a dict"""
+        cursor = self._get_connection().execute(query, params)
+        try:
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block of writes in one IMMEDIATE transaction on the pooled connection"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        # Take the write lock up front so read-then-write blocks wait on busy_timeout
+        # instead of failing when another writer commits first
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def close(self):
+        """Close the calling thread's pooled connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+    def migrate(self):
+        """Apply the schema migrations this database hasn't had yet, oldest first
+
+        Migration N brings the schema from version N-1 to N and records N in
+        PRAGMA user_version in the same transaction, so an interrupted run
+        resumes where it stopped. Returns the number of migrations applied.
+        """
+        applied = 0
+        current = self._get_connection().execute('PRAGMA user_version').fetchone()[0]
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            migration = getattr(self, f'_migration_{version}')
+            with self._transaction() as cursor:
+                # Another worker may have applied it while we waited for the write lock
+                if cursor.execute('PRAGMA user_version').fetchone()[0] >= version:
+                    continue
+                print(f"Applying schema migration {version}: {migration.__doc__}")
+                migration(cursor)
+                cursor.execute(f'PRAGMA user_version = {version}')
+            applied += 1
+        return applied
+
+    def _add_version_counter(self, cursor, table):
+        """Add a table_versions row for a table and the triggers that bump it"""
+        cursor.execute("INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, 0)", (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table}
+            BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+            END
+            ''')
+
+    # Every migration uses IF NOT EXISTS, since databases created before the
+    # runner existed may already have some of what it adds
+
+    def _migration_1(self, cursor):
+        """Base tables, image reference counts, change counters and pagination indexes"""
         # Users table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -127,28 +970,210 @@ class DatabaseStorage:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         ''')
+        # Reference counts of image files, kept up to date by triggers on portfolio_items
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='image_refs'")
+        backfill_image_refs = cursor.fetchone() is None
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS image_refs (
+            filename TEXT PRIMARY KEY,
+            refcount INTEGER NOT NULL DEFAULT 0
+        )
+        ''')
+        if backfill_image_refs:
+            cursor.execute('''
+            INSERT INTO image_refs (filename, refcount)
+            SELECT image_filename, COUNT(*) FROM portfolio_items GROUP BY image_filename
+            ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS image_refs_insert AFTER INSERT ON portfolio_items
+        BEGIN
+            INSERT INTO image_refs (filename, refcount) VALUES (NEW.image_filename, 1)
+            ON CONFLICT (filename) DO UPDATE SET refcount = refcount + 1;
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS image_refs_update AFTER UPDATE OF image_filename ON portfolio_items
+        WHEN OLD.image_filename != NEW.image_filename
+        BEGIN
+            UPDATE image_refs SET refcount = refcount - 1 WHERE filename = OLD.image_filename;
+            INSERT INTO image_refs (filename, refcount) VALUES (NEW.image_filename, 1)
+            ON CONFLICT (filename) DO UPDATE SET refcount = refcount + 1;
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS image_refs_delete AFTER DELETE ON portfolio_items
+        BEGIN
+            UPDATE image_refs SET refcount = refcount - 1 WHERE filename = OLD.image_filename;
+        END
+        ''')
 
-        conn.commit()
-        conn.close()
+        # Change counters bumped by triggers, so every worker (and the mobile app's
+        # own writes) can tell cheaply whether a table changed since it last looked
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        ''')
+        for table in ('orders', 'portfolio_items'):
+            self._add_version_counter(cursor, table)
+
+        # Keyset pagination indexes; the status one also covers the per-status counters
+        cursor.execute('DROP INDEX IF EXISTS idx_orders_status')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_status_created ON orders (status, created_at, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_created ON orders (created_at, id)')
+
+    def _migration_2(self, cursor):
+        """Full-text search indexes"""
+        # External-content FTS5 tables, so the text isn't stored twice, kept in step with
+        # their tables by triggers
+        for table, columns in SEARCH_COLUMNS.items():
+            fts = f'{table}_fts'
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f'NEW.{column}' for column in columns)
+            old_values = ', '.join(f'OLD.{column}' for column in columns)
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (fts,))
+            backfill = cursor.fetchone() is None
+            cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list}, content='{table}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+            ''')
+            if backfill:
+                cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+            END
+            ''')
+            # Only edits to indexed columns touch the index, status changes don't
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {column_list} ON {table}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', OLD.id, {old_values});
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+            END
+            ''')
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', OLD.id, {old_values});
+            END
+            ''')
+
+    def _migration_3(self, cursor):
+        """Daily order statistics"""
+        # Orders per day, status and service, kept current by triggers so dashboard trends
+        # read at most a few rows per day instead of aggregating the whole orders table.
+        # NULLs are stored as '' because primary key columns of a WITHOUT ROWID table can't be NULL
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='order_stats_daily'")
+        backfill_order_stats = cursor.fetchone() is None
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_stats_daily (
+            day TEXT NOT NULL,
+            status TEXT NOT NULL,
+            service_name TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, status, service_name)
+        ) WITHOUT ROWID
+        ''')
+        if backfill_order_stats:
+            cursor.execute('''
+            INSERT INTO order_stats_daily (day, status, service_name, total)
+            SELECT IFNULL(date(created_at), ''), IFNULL(status, ''), IFNULL(service_name, ''), COUNT(*)
+            FROM orders GROUP BY 1, 2, 3
+            ''')
+
+        def stats_key(row):
+            return f"IFNULL(date({row}.created_at), ''), IFNULL({row}.status, ''), IFNULL({row}.service_name, '')"
+
+        add_order = f'''
+            INSERT INTO order_stats_daily (day, status, service_name, total) VALUES ({stats_key('NEW')}, 1)
+            ON CONFLICT (day, status, service_name) DO UPDATE SET total = total + 1;'''
+        remove_order = f'''
+            UPDATE order_stats_daily SET total = total - 1
+            WHERE (day, status, service_name) = ({stats_key('OLD')});'''
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS order_stats_insert AFTER INSERT ON orders
+        BEGIN {add_order}
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS order_stats_update AFTER UPDATE OF status, service_name, created_at ON orders
+        WHEN ({stats_key('OLD')}) IS NOT ({stats_key('NEW')})
+        BEGIN {remove_order} {add_order}
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS order_stats_delete AFTER DELETE ON orders
+        BEGIN {remove_order}
+        END
+        ''')
+
+    def _migration_4(self, cursor):
+        """Order change log"""
+        # Append-only log of order changes for incremental sync; seq is the client cursor.
+        # Existing orders are logged as inserts on creation so since=0 is a full sync
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='order_changes'")
+        backfill_order_changes = cursor.fetchone() is None
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_changes_order ON order_changes (order_id, seq)')
+        if backfill_order_changes:
+            cursor.execute("INSERT INTO order_changes (order_id, op) SELECT id, 'insert' FROM orders ORDER BY id")
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            row = 'OLD' if event == 'DELETE' else 'NEW'
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS order_changes_{event.lower()} AFTER {event} ON orders
+            BEGIN
+                INSERT INTO order_changes (order_id, op) VALUES ({row}.id, '{event.lower()}');
+            END
+            ''')
+        # Highest seq dropped by retention; cursors below it can no longer be served
+        cursor.execute("INSERT OR IGNORE INTO table_versions (name, version) VALUES ('order_changes_pruned', 0)")
+
+    def _migration_5(self, cursor):
+        """Change counter for contact_messages"""
+        self._add_version_counter(cursor, 'contact_messages')
+
+    def _migration_6(self, cursor):
+        """Indexes for portfolio category lookups and the latest contact messages"""
+        # Category lookups compare LOWER(category), which a plain column index can't serve
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_items_category ON portfolio_items (LOWER(category))')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contact_messages_created ON contact_messages (created_at)')
+        # No ANALYZE here: statistics taken while the tables are nearly empty steer the planner
+        # badly once they grow. optimize() gathers them when there's traffic to base them on
+
+    def _migration_7(self, cursor):
+        """Indexes for order change log compaction"""
+        # Both compaction queries look for entries older than a cutoff; without these they scan the log.
+        # Expiring deletions only needs delete entries, which a partial index keeps small
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_changes_changed ON order_changes (changed_at)')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_changes_deleted ON order_changes (changed_at) "
+                       "WHERE op = 'delete'")
 
     def _init_users(self):
         """Initialize admin user if not exists"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Check if admin user exists
-        cursor.execute('SELECT COUNT(*) FROM users WHERE username = ?', ('admin',))
-        if cursor.fetchone()[0] == 0:
-            # Create admin user
-            cursor.execute(
-                'INSERT INTO users (username, password, name, is_admin) VALUES (?, ?, ?, ?)',
-                ('admin', 'admin', 'Administrator', 1)
-            )
-            conn.commit()
-            print("Created admin user")
-
-        conn.close()
+        with self._transaction() as cursor:
+            # Check if admin user exists
+            cursor.execute('SELECT COUNT(*) FROM users WHERE username = ?', ('admin',))
+            if cursor.fetchone()[0] == 0:
+                # Create admin user
+                cursor.execute(
+                    'INSERT INTO users (username, password, name, is_admin) VALUES (?, ?, ?, ?)',
+                    ('admin', 'admin', 'Administrator', 1)
+                )
+                print("Created admin user")
 
     def _load_portfolio_items(self):
         """Load portfolio items from database or initialize with defaults"""
@@ -173,26 +1198,10 @@ class DatabaseStorage:
         ]
 
         # Load portfolio items from database
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        # Check if portfolio_items table exists and has data
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='portfolio_items'")
-        table_exists = cursor.fetchone() is not None
-
-        if table_exists:
-            cursor.execute("SELECT COUNT(*) FROM portfolio_items")
-            count = cursor.fetchone()[0]
-
-            if count > 0:
-                # Load portfolio items from database
-                cursor.execute("SELECT * FROM portfolio_items ORDER BY id")
-                self.portfolio_items = [dict(row) for row in cursor.fetchall()]
-                print(f"Loaded {len(self.portfolio_items)} portfolio items from database")
-                conn.close()
-                return
+        portfolio = self._reload_portfolio()
+        if portfolio.items:
+            print(f"Loaded {len(portfolio.items)} portfolio items from database")
+            return
 
         # If no items in database, initialize with defaults
         default_items = [
@@ -220,94 +1229,359 @@ class DatabaseStorage:
         ]
 
         # Insert default items into database
-        for item in default_items:
-            cursor.execute(
-                "INSERT INTO portfolio_items (title, description, category, image_filename, created_at) VALUES (?, ?, ?, ?, ?)",
-                (item['title'], item['description'], item['category'], item['image_filename'], item['created_at'])
-            )
-
-        conn.commit()
+        with self._transaction() as cursor:
+            for item in default_items:
+                cursor.execute(
+                    "INSERT INTO portfolio_items (title, description, category, image_filename, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (item['title'], item['description'], item['category'], item['image_filename'], item['created_at'])
+                )
 
         # Get the inserted items with their IDs
-        cursor.execute("SELECT * FROM portfolio_items ORDER BY id")
-        self.portfolio_items = [dict(row) for row in cursor.fetchall()]
-        print(f"Initialized {len(self.portfolio_items)} default portfolio items in database")
-
-        conn.close()
+        portfolio = self._reload_portfolio()
+        print(f"Initialized {len(portfolio.items)} default portfolio items in database")
 
     def get_user(self, username, password):
         """Get a user by username and password"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        return self._fetch_one('SELECT * FROM users WHERE username = ? AND password = ?', (username, password))
 
-        cursor.execute('SELECT * FROM users WHERE username = ? AND password = ?', (username, password))
-        user = cursor.fetchone()
+    def get_orders(self, status=None, after=None, limit=None):
+        """Get orders newest first, optionally filtered by status
 
-        conn.close()
-        return dict(user) if user else None
-
-    def get_orders(self, status=None):
-        """Get orders from the database, optionally filtered by status"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        Pass the (created_at, id) cursor of the last order already seen as
+        `after` to continue from there, and `limit` to cap the page size.
+        """
+        conditions = []
+        params = []
 
         if status:
-            cursor.execute('SELECT * FROM orders WHERE status = ? ORDER BY created_at DESC', (status,))
-        else:
-            cursor.execute('SELECT * FROM orders ORDER BY created_at DESC')
-
-        orders = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return orders
+            conditions.append('status = ?')
+            params.append(status)
+        if after:
+            conditions.append('(created_at, id) < (?, ?)')
+            params.extend(after)
+
+        query = 'SELECT * FROM orders'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY created_at DESC, id DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        return self._fetch_all(query, params)
+
+    def add_orders(self, orders):
+        """Insert validated orders in one transaction and return their ids, in the same order"""
+        ids = []
+        with self._transaction() as cursor:
+            for order in orders:
+                cursor.execute('''
+                INSERT INTO orders (name, email, phone, service_name, requirements, status)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', (order['name'], order['email'], order.get('phone'), order['service_name'],
+                      order['requirements'], order.get('status') or 'pending'))
+                ids.append(cursor.lastrowid)
+
+        if ids:
+            self._invalidate_order_counts()
+        return ids
+
+    def iter_orders(self, status=None, date_from=None, date_to=None, batch_size=EXPORT_BATCH_SIZE):
+        """Yield (column names, batch of row tuples) for orders oldest first, fetched batch_size at a time
+
+        Uses a dedicated read-only connection, closed when the generator is
+        exhausted or closed. Under WAL the read never blocks writers, so a long
+        export doesn't hold up order updates. `date_to` is inclusive.
+        """
+        # Make sure the schema exists before opening the read-only connection
+        self._get_connection()
+
+        conditions = []
+        params = []
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        if date_from:
+            conditions.append('created_at >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append("created_at < date(?, '+1 day')")
+            params.append(date_to)
+
+        query = 'SELECT * FROM orders'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY created_at, id'
+
+        conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, timeout=SQLITE_BUSY_TIMEOUT,
+                               factory=InstrumentedConnection)
+        try:
+            cursor = conn.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            # The first batch is yielded even when empty, so a CSV export always gets its header
+            rows = cursor.fetchmany(batch_size)
+            yield columns, rows
+            while rows:
+                rows = cursor.fetchmany(batch_size)
+                if rows:
+                    yield columns, rows
+        finally:
+            conn.close()
 
     def get_order(self, order_id):
         """Get a specific order by ID"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM orders WHERE id = ?', (order_id,))
-        order = cursor.fetchone()
-
-        conn.close()
-        return dict(order) if order else None
+        return self._fetch_one('SELECT * FROM orders WHERE id = ?', (order_id,))
 
     def update_order_status(self, order_id, status):
         """Update the status of an order"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('UPDATE orders SET status = ? WHERE id = ?', (status, order_id))
-        conn.commit()
+        with self._transaction() as cursor:
+            cursor.execute('UPDATE orders SET status = ? WHERE id = ?', (status, order_id))
+            success = cursor.rowcount > 0
 
-        success = cursor.rowcount > 0
-        conn.close()
+        if success:
+            self._invalidate_order_counts()
         return success
 
-    def get_contact_messages(self):
-        """Get all contact messages"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM contact_messages ORDER BY created_at DESC')
-        messages = [dict(row) for row in cursor.fetchall()]
+    def update_order_statuses(self, order_ids, status):
+        """Set the status of many orders in one transaction
+
+        Returns {order_id: 'updated' | 'unchanged' | 'not_found'} for every
+        requested id. An unknown status raises ValueError before anything is written.
+        """
+        if status not in ORDER_STATUSES:
+            raise ValueError(f"Unknown order status: {status}")
+        if isinstance(order_ids, (str, bytes)):
+            raise TypeError("order_ids must be a collection of ids, not a string")
+
+        order_ids = list(dict.fromkeys(int(order_id) for order_id in order_ids))
+        if not order_ids:
+            return {}
+
+        with self._transaction() as cursor:
+            # One lookup for the whole batch; json_each avoids SQLite's bound-parameter limit
+            cursor.execute('SELECT id, status FROM orders WHERE id IN (SELECT value FROM json_each(?))',
+                           (json.dumps(order_ids),))
+            current = {row['id']: row['status'] for row in cursor.fetchall()}
+
+            changed = [order_id for order_id in order_ids if order_id in current and current[order_id] != status]
+            cursor.executemany('UPDATE orders SET status = ? WHERE id = ?',
+                               [(status, order_id) for order_id in changed])
+
+        if changed:
+            self._invalidate_order_counts()
+
+        changed = set(changed)
+        return {order_id: 'updated' if order_id in changed else 'unchanged' if order_id in current else 'not_found'
+                for order_id in order_ids}
+
+    def get_table_version(self, name):
+        """Get the trigger-maintained change counter for a table"""
+        row = self._fetch_one('SELECT version FROM table_versions WHERE name = ?', (name,))
+        return row['version'] if row else 0
+
+    def get_table_versions(self, names):
+        """Get the change counters of several tables in one query, as a tuple in the order given"""
+        rows = self._fetch_all(f"SELECT name, version FROM table_versions WHERE name IN ({', '.join('?' * len(names))})",
+                               tuple(names))
+        versions = {row['name']: row['version'] for row in rows}
+        return tuple(versions.get(name, 0) for name in names)
+
+    def wait_for_table_change(self, name, version, timeout):
+        """Block until a table's change counter differs from version or the timeout passes
+
+        Returns the current version. Each check is a single primary key lookup,
+        so holding many idle waiters open stays cheap.
+        """
+        deadline = time.monotonic() + timeout
+        current = self.get_table_version(name)
+        while current == version:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(NOTIFICATIONS_POLL_INTERVAL, remaining))
+            current = self.get_table_version(name)
+        return current
+
+    def count_orders_by_status(self):
+        """Get the number of orders per status, served from cache while the orders table is unchanged"""
+        version = self.get_table_version('orders')
+        cached = self._order_counts
+        if cached is not None and cached[0] == version:
+            return dict(cached[1])
+
+        # One pass over the status index instead of loading every order
+        counts = {status: 0 for status in ORDER_STATUSES}
+        for row in self._fetch_all('SELECT status, COUNT(*) AS total FROM orders GROUP BY status'):
+            counts[row['status']] = row['total']
+
+        self._order_counts = (version, counts)
+        return dict(counts)
+
+    def _invalidate_order_counts(self):
+        """Drop the cached per-status counts after a local write to orders"""
+        self._order_counts = None
+
+    def search(self, text, table='orders', status=None, limit=ORDERS_PAGE_SIZE, offset=0):
+        """Full-text search orders or contact messages, best matches first
+
+        Every word in `text` must match the start of a word in one of the
+        indexed columns. Returns the matching rows as dicts with their bm25
+        `rank` added (lower is better); `status` only applies to orders.
+        """
+        if table not in SEARCH_COLUMNS:
+            raise ValueError(f"No search index for table: {table}")
+
+        match = build_search_query(text)
+        if not match:
+            return []
+
+        fts = f'{table}_fts'
+        query = f'SELECT t.*, {fts}.rank AS rank FROM {fts} JOIN {table} t ON t.id = {fts}.rowid WHERE {fts} MATCH ?'
+        params = [match]
+        if status and table == 'orders':
+            query += ' AND t.status = ?'
+            params.append(status)
+        query += f' ORDER BY {fts}.rank, t.id DESC LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+
+        return self._fetch_all(query, params)
+
+    def get_order_trends(self, days=TREND_DEFAULT_DAYS):
+        """Orders created per day over the last `days` days (UTC), in total, per status and per service
+
+        Returns {'days': [...], 'total': [...], 'by_status': {status: [...]},
+        'by_service': {service: [...]}}, every series aligned with 'days' and
+        zero-filled. Reads only the order_stats_daily rollup, so the cost
+        depends on the period, not on how many orders there are. Statuses
+        are the orders' current ones.
+        """
+        today = datetime.now(timezone.utc).date()
+        day_list = [(today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+        index = {day: position for position, day in enumerate(day_list)}
+
+        total = [0] * days
+        by_status = {status: [0] * days for status in ORDER_STATUSES}
+        by_service = {}
+        rows = self._fetch_all('SELECT day, status, service_name, total FROM order_stats_daily '
+                               'WHERE day >= ? AND total != 0', (day_list[0],))
+        for row in rows:
+            position = index.get(row['day'])
+            if position is None:
+                continue
+            total[position] += row['total']
+            by_status.setdefault(row['status'], [0] * days)[position] += row['total']
+            by_service.setdefault(row['service_name'], [0] * days)[position] += row['total']
+
+        return {'days': day_list, 'total': total, 'by_status': by_status, 'by_service': by_service}
+
+    def get_order_changes(self, since=0, limit=ORDER_CHANGES_PAGE_SIZE):
+        """Order changes logged after seq `since`, oldest first, with each order's current row
+
+        Returns a list of dicts with seq, order_id, op ('insert', 'update' or
+        'delete'), changed_at and order (None once the order is deleted), or
+        None when deletions after `since` have expired from the log and the
+        client has to resync from 0. Each page is one range scan on the
+        primary key.
+        """
+        if 0 < since < self.get_table_version('order_changes_pruned'):
+            return None
 
-        conn.close()
-        return messages
+        rows = self._fetch_all('''
+        SELECT c.seq, c.order_id, c.op, c.changed_at, o.*
+        FROM order_changes c LEFT JOIN orders o ON o.id = c.order_id
+        WHERE c.seq > ? ORDER BY c.seq LIMIT ?
+        ''', (since, limit))
+
+        changes = []
+        for row in rows:
+            change = {key: row.pop(key) for key in ('seq', 'order_id', 'op', 'changed_at')}
+            change['order'] = row if row['id'] is not None else None
+            changes.append(change)
+        return changes
+
+    def compact_order_changes(self, retention_days=ORDER_CHANGES_RETENTION_DAYS,
+                              compact_after=ORDER_CHANGES_COMPACT_AFTER):
+        """Drop superseded entries and expired deletions from the order change log
+
+        Entries older than compact_after seconds are removed when a later entry
+        exists for the same order; clients still see that order change, since
+        every entry carries the current row. That leaves one entry per existing
+        order, so since=0 always returns every order. Deletions older than
+        retention_days are removed and recorded in the pruned watermark, and
+        cursors before it get a resync. Returns the number of entries removed.
+        """
+        with self._transaction() as cursor:
+            cursor.execute('''
+            DELETE FROM order_changes
+            WHERE changed_at < datetime('now', ?)
+            AND seq < (SELECT MAX(later.seq) FROM order_changes later WHERE later.order_id = order_changes.order_id)
+            ''', (f'-{int(compact_after)} seconds',))
+            removed = cursor.rowcount
+
+            # MAX(+seq), not MAX(seq): the latter lets SQLite walk the whole log backwards by seq
+            # instead of reading the few old deletions from idx_order_changes_deleted
+            cursor.execute("SELECT MAX(+seq) FROM order_changes WHERE op = 'delete' AND changed_at < datetime('now', ?)",
+                           (f'-{int(retention_days)} days',))
+            pruned = cursor.fetchone()[0]
+            if pruned is not None:
+                cursor.execute("DELETE FROM order_changes WHERE op = 'delete' AND seq <= ?", (pruned,))
+                removed += cursor.rowcount
+                cursor.execute("UPDATE table_versions SET version = MAX(version, ?) WHERE name = 'order_changes_pruned'",
+                               (pruned,))
+        return removed
+
+    def optimize(self):
+        """Let SQLite re-analyze tables whose planner statistics have gone stale
+
+        PRAGMA optimize only runs ANALYZE where it would likely change query
+        plans, and analysis_limit caps the rows it samples, so this is cheap
+        enough to run from a worker.
+        """
+        conn = self._get_connection()
+        conn.execute(f'PRAGMA analysis_limit = {SQLITE_ANALYSIS_LIMIT}')
+        conn.execute('PRAGMA optimize')
+
+    def start_maintenance(self):
+        """Start this process's maintenance thread if it isn't running; cheap to call on every request"""
+        if self._maintenance_pid == os.getpid() and self._maintenance_thread.is_alive():
+            return
+        with self._maintenance_lock:
+            # Threads don't survive a fork, so each gunicorn worker starts its own
+            if self._maintenance_thread is None or not self._maintenance_thread.is_alive() \
+                    or self._maintenance_pid != os.getpid():
+                self._maintenance_pid = os.getpid()
+                self._maintenance_thread = threading.Thread(target=self._run_maintenance,
+                                                            name='database-maintenance', daemon=True)
+                self._maintenance_thread.start()
+
+    def _run_maintenance(self):
+        while True:
+            time.sleep(DATABASE_MAINTENANCE_INTERVAL)
+            self.run_maintenance()
+
+    def run_maintenance(self):
+        """Compact the order change log and refresh planner statistics"""
+        try:
+            removed = self.compact_order_changes()
+            if removed:
+                print(f"Compacted order change log, removed {removed} entries")
+            self.optimize()
+        except sqlite3.Error as e:
+            print(f"Error during database maintenance: {e}")
+
+    def get_order_change_seq(self, order_id):
+        """Latest change log seq for one order (an index lookup), or None if the order was never logged"""
+        row = self._fetch_one('SELECT MAX(seq) AS seq FROM order_changes WHERE order_id = ?', (order_id,))
+        return row['seq'] if row else None
+
+    def get_contact_messages(self, limit=None):
+        """Get contact messages newest first, all of them unless limit is given"""
+        if limit is not None:
+            return self._fetch_all('SELECT * FROM contact_messages ORDER BY created_at DESC LIMIT ?', (limit,))
+        return self._fetch_all('SELECT * FROM contact_messages ORDER BY created_at DESC')
 
     def _create_sample_portfolio_images(self):
         """Create sample portfolio images if they don't exist"""
-        # Create simple colored rectangles as sample images
-        from PIL import Image, ImageDraw, ImageFont
-
         # Define colors and filenames for each service
         # Using clear service prefixes to ensure proper categorization in the mobile app
         service_images = [
@@ -355,54 +1629,61 @@ class DatabaseStorage:
                 print(f"Sample image already exists: {filepath}")
                 continue
 
-            # Create a colored image
-            img = Image.new('RGB', (400, 250), color=color)
-            draw = ImageDraw.Draw(img)
-
-            # Add a white border
-            draw.rectangle([10, 10, 390, 240], outline=(255, 255, 255), width=5)
-
-            # Add a simple icon or design element in the center (instead of text)
-            try:
-                # Draw a simple design element (circle)
-                center_x, center_y = 200, 125
-                radius = 50
-                draw.ellipse((center_x - radius, center_y - radius,
-                             center_x + radius, center_y + radius),
-                             outline=(255, 255, 255), width=3)
-
-                # Draw a smaller inner circle with the service color but brighter
-                inner_radius = 30
-                r, g, b = color
-                brighter_color = (min(r + 50, 255), min(g + 50, 255), min(b + 50, 255))
-                draw.ellipse((center_x - inner_radius, center_y - inner_radius,
-                             center_x + inner_radius, center_y + inner_radius),
-                             fill=brighter_color, outline=(255, 255, 255), width=1)
-            except Exception as e:
-                print(f"Error adding design element to image: {e}")
-
-            # Save the image
-            img.save(filepath, 'JPEG')
+            # Save a colored image with a simple design element in the center
+            write_file_atomically(filepath, render_placeholder_image(color, emblem=True))
             print(f"Created sample image: {filepath}")
 
+    def _reload_portfolio(self):
+        """Read all portfolio items from the database and publish a new read-only snapshot"""
+        with self._portfolio_reload_lock:
+            # Read the version first so a concurrent write can only make the cache look stale, never fresh
+            version = self.get_table_version('portfolio_items')
+            items = tuple(MappingProxyType(item) for item in self._fetch_all("SELECT * FROM portfolio_items ORDER BY id"))
+
+            by_category = {}
+            for item in items:
+                by_category.setdefault(item['category'].lower(), []).append(item)
+
+            self._portfolio = PortfolioSnapshot(
+                version, items,
+                MappingProxyType({item['id']: item for item in items}),
+                MappingProxyType({category: tuple(members) for category, members in by_category.items()}))
+            return self._portfolio
+
+    def _get_portfolio(self):
+        """Get the cached portfolio, reloading it if any worker has changed the table since"""
+        portfolio = self._portfolio
+        version = self.get_table_version('portfolio_items')
+        if portfolio is not None and portfolio.version == version:
+            return portfolio
+
+        # Only one thread reloads; the others wait for it and reuse its snapshot
+        with self._portfolio_reload_lock:
+            portfolio = self._portfolio
+            if portfolio is None or portfolio.version < version:
+                portfolio = self._reload_portfolio()
+        return portfolio
+
+    @property
+    def portfolio_items(self):
+        """Current portfolio items, as used by the sync snapshot"""
+        return self._get_portfolio().items
+
     def get_portfolio_items(self):
         """Get all portfolio items"""
-        return self.portfolio_items
+        return self._get_portfolio().items
 
     def get_portfolio_item(self, item_id):
         """Get a portfolio item by ID"""
-        for item in self.portfolio_items:
-            if item['id'] == item_id:
-                return item
-        return None
+        return self._get_portfolio().by_id.get(item_id)
+
+    def get_portfolio_items_by_category(self, category):
+        """Get the portfolio items in a category (case-insensitive)"""
+        return self._get_portfolio().by_category.get(category.lower(), ())
 
+    @portfolio_writer
     def add_portfolio_item(self, title, description, category, image_filename):
         """Add a new portfolio item"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
         # Normalize category to match app's service names
         normalized_category = category
         if category.lower() not in ['printing press', 'seo', 'packages solutions']:
@@ -419,53 +1700,38 @@ class DatabaseStorage:
 
             print(f"Normalized category from '{category}' to '{normalized_category}'")
 
-        # Delete existing portfolio items and images for this category from database
-        cursor.execute("SELECT * FROM portfolio_items WHERE LOWER(category) = LOWER(?)", (normalized_category,))
-        items_to_delete = cursor.fetchall()
-
-        for item in items_to_delete:
-            # Delete the image file
-            try:
-                old_image = item['image_filename']
-                old_path = os.path.join(app.config['PORTFOLIO_FOLDER'], old_image)
-                if os.path.exists(old_path):
-                    os.remove(old_path)
-                    print(f"Deleted old image from shared directory: {old_path}")
-            except Exception as e:
-                print(f"Error removing old image: {e}")
-
-            # Delete the item from database
-            cursor.execute("DELETE FROM portfolio_items WHERE id = ?", (item['id'],))
-            print(f"Deleted existing portfolio item (ID: {item['id']}) for category: {normalized_category}")
+        with self._transaction() as cursor:
+            # Delete existing portfolio items and images for this category from database
+            cursor.execute("SELECT * FROM portfolio_items WHERE LOWER(category) = LOWER(?)", (normalized_category,))
+            items_to_delete = cursor.fetchall()
 
-        # Insert new portfolio item into database
-        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute(
-            "INSERT INTO portfolio_items (title, description, category, image_filename, created_at) VALUES (?, ?, ?, ?, ?)",
-            (title, description, normalized_category, image_filename, created_at)
-        )
+            for item in items_to_delete:
+                # Delete the item from database (its image is released through image_refs)
+                cursor.execute("DELETE FROM portfolio_items WHERE id = ?", (item['id'],))
+                print(f"Deleted existing portfolio item (ID: {item['id']}) for category: {normalized_category}")
 
-        # Get the inserted item ID
-        new_id = cursor.lastrowid
+            # Insert new portfolio item into database
+            created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            cursor.execute(
+                "INSERT INTO portfolio_items (title, description, category, image_filename, created_at) VALUES (?, ?, ?, ?, ?)",
+                (title, description, normalized_category, image_filename, created_at)
+            )
 
-        # Commit changes
-        conn.commit()
+            # Get the inserted item ID
+            new_id = cursor.lastrowid
 
-        # Get the inserted item
-        cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (new_id,))
-        new_item = dict(cursor.fetchone())
+            # Get the inserted item
+            cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (new_id,))
+            new_item = dict(cursor.fetchone())
 
-        # Close connection
-        conn.close()
+        # Delete images no portfolio item refers to anymore
+        self.collect_unreferenced_images()
 
-        # Update in-memory list
-        # First remove any items with the same category
-        self.portfolio_items = [item for item in self.portfolio_items if item['category'].lower() != normalized_category.lower()]
-        # Then add the new item
-        self.portfolio_items.append(new_item)
+        # Refresh the in-memory cache
+        self._reload_portfolio()
 
-        # Save portfolio items to pickle file for sync script
-        self._save_portfolio_items_to_pickle()
+        # Save the portfolio snapshot for the sync script
+        self._save_portfolio_snapshot()
 
         # No need to copy the image to the app's assets directory anymore
         # since we're using a shared directory structure
@@ -474,128 +1740,151 @@ class DatabaseStorage:
 
         return new_item
 
-    def _save_portfolio_items_to_pickle(self):
-        """Save portfolio items to a pickle file for the sync script"""
-        try:
-            pickle_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "portfolio_items.pickle")
-            with open(pickle_path, "wb") as f:
-                pickle.dump(self.portfolio_items, f)
-            print(f"Saved {len(self.portfolio_items)} portfolio items to pickle file")
-        except Exception as e:
-            print(f"Error saving portfolio items to pickle file: {e}")
+    @contextmanager
+    def image_files_locked(self):
+        """Hold the database write lock while creating or reusing a shared image file"""
+        with self._transaction():
+            yield
 
-    def update_portfolio_item(self, item_id, title, description, category, image_filename=None):
-        """Update an existing portfolio item"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    def collect_unreferenced_images(self):
+        """Delete image files (and their variants) that no portfolio item refers to anymore
 
-        # Get the item we're updating from database
-        cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (item_id,))
-        target_item = cursor.fetchone()
+        Reference counts live in image_refs and are kept up to date by triggers
+        on portfolio_items. Files touched within IMAGE_GC_GRACE_SECONDS are left
+        alone so an upload that is about to be referenced isn't collected.
+        """
+        removed = []
+        for row in self._fetch_all('SELECT filename FROM image_refs WHERE refcount <= 0'):
+            filename = row['filename']
+            path = os.path.join(app.config['PORTFOLIO_FOLDER'], filename)
 
-        if not target_item:
-            conn.close()
-            return None
+            try:
+                # Check and remove under the write lock: store_uploaded_image decides whether to
+                # reuse a file under the same lock, so it can't pick up a file we are removing
+                with self._transaction() as cursor:
+                    if os.path.exists(path) and time.time() - os.path.getmtime(path) < IMAGE_GC_GRACE_SECONDS:
+                        continue
+                    cursor.execute('DELETE FROM image_refs WHERE filename = ? AND refcount <= 0', (filename,))
+                    if cursor.rowcount == 0:
+                        continue
+
+                    if os.path.exists(path):
+                        os.remove(path)
+                        print(f"Deleted image from shared directory: {path}")
+                    remove_image_variants(filename)
+                forget_portfolio_file_stat(path)
+                removed.append(filename)
+            except Exception as e:
+                print(f"Error removing image {filename}: {e}")
 
-        # Convert to dict for easier handling
-        target_item = dict(target_item)
+        return removed
 
-        # Store the original category for comparison
-        original_category = target_item['category']
+    def _save_portfolio_snapshot(self):
+        """Write the portfolio snapshot (and legacy pickle) for the sync script if the items changed"""
+        try:
+            items = [dict(item) for item in self.portfolio_items]
+            lines = [json.dumps(item, sort_keys=True, separators=(',', ':')) for item in items]
+            content_hash = hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+
+            # Another worker may already have written the same content
+            header = read_portfolio_snapshot_header(PORTFOLIO_SNAPSHOT_PATH)
+            snapshot_current = header is not None and header.get('content_hash') == content_hash
+            pickle_current = not WRITE_LEGACY_PICKLE or (snapshot_current and os.path.exists(PORTFOLIO_PICKLE_PATH))
+            if snapshot_current and pickle_current:
+                return False
+
+            if not snapshot_current:
+                header = {
+                    'format': 'portfolio_items',
+                    'format_version': PORTFOLIO_SNAPSHOT_FORMAT_VERSION,
+                    'count': len(items),
+                    'content_hash': content_hash,
+                    'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }
+                data = '\n'.join([json.dumps(header, sort_keys=True)] + lines) + '\n'
+                write_file_atomically(PORTFOLIO_SNAPSHOT_PATH, data.encode('utf-8'))
+                print(f"Saved {len(items)} portfolio items to snapshot file")
+
+            if WRITE_LEGACY_PICKLE:
+                import pickle
+                write_file_atomically(PORTFOLIO_PICKLE_PATH, pickle.dumps(items))
+                print(f"Saved {len(items)} portfolio items to pickle file")
+            return True
+        except Exception as e:
+            print(f"Error saving portfolio snapshot: {e}")
+            return False
 
-        # Normalize category to match app's service names
-        normalized_category = category
-        if category.lower() not in ['printing press', 'seo', 'packages solutions']:
-            # Map to one of the three valid categories
-            if 'print' in category.lower() or 'press' in category.lower():
-                normalized_category = 'Printing Press'
-            elif 'seo' in category.lower() or 'search' in category.lower():
-                normalized_category = 'SEO'
-            elif 'package' in category.lower() or 'solution' in category.lower():
-                normalized_category = 'Packages Solutions'
+    @portfolio_writer
+    def update_portfolio_item(self, item_id, title, description, category, image_filename=None):
+        """Update an existing portfolio item"""
+        with self._transaction() as cursor:
+            # Get the item we're updating from database
+            cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (item_id,))
+            target_item = cursor.fetchone()
+
+            if not target_item:
+                return None
+
+            # Convert to dict for easier handling
+            target_item = dict(target_item)
+
+            # Store the original category for comparison
+            original_category = target_item['category']
+
+            # Normalize category to match app's service names
+            normalized_category = category
+            if category.lower() not in ['printing press', 'seo', 'packages solutions']:
+                # Map to one of the three valid categories
+                if 'print' in category.lower() or 'press' in category.lower():
+                    normalized_category = 'Printing Press'
+                elif 'seo' in category.lower() or 'search' in category.lower():
+                    normalized_category = 'SEO'
+                elif 'package' in category.lower() or 'solution' in category.lower():
+                    normalized_category = 'Packages Solutions'
+                else:
+                    # Default to Printing Press if no match
+                    normalized_category = 'Printing Press'
+
+                print(f"Normalized category from '{category}' to '{normalized_category}'")
+
+            # If the category has changed or a new image is provided, we need to handle other items
+            if original_category.lower() != normalized_category.lower() or image_filename:
+                # Delete all other items in the same category from database
+                cursor.execute("SELECT * FROM portfolio_items WHERE LOWER(category) = LOWER(?) AND id != ?",
+                              (normalized_category, item_id))
+                items_to_delete = cursor.fetchall()
+
+                for item in items_to_delete:
+                    # Delete the item from database (its image is released through image_refs)
+                    cursor.execute("DELETE FROM portfolio_items WHERE id = ?", (item['id'],))
+                    print(f"Deleted existing portfolio item (ID: {item['id']}) for category: {normalized_category}")
+
+            # Handle the image update for the current item
+            if image_filename:
+                # Update the image filename in the database (the previous image is released through image_refs)
+                cursor.execute(
+                    "UPDATE portfolio_items SET title = ?, description = ?, category = ?, image_filename = ? WHERE id = ?",
+                    (title, description, normalized_category, image_filename, item_id)
+                )
             else:
-                # Default to Printing Press if no match
-                normalized_category = 'Printing Press'
-
-            print(f"Normalized category from '{category}' to '{normalized_category}'")
-
-        # If the category has changed or a new image is provided, we need to handle other items
-        if original_category.lower() != normalized_category.lower() or image_filename:
-            # Delete all other items in the same category from database
-            cursor.execute("SELECT * FROM portfolio_items WHERE LOWER(category) = LOWER(?) AND id != ?",
-                          (normalized_category, item_id))
-            items_to_delete = cursor.fetchall()
-
-            for item in items_to_delete:
-                # Delete the image file
-                try:
-                    old_image = item['image_filename']
-                    old_path = os.path.join(app.config['PORTFOLIO_FOLDER'], old_image)
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
-                        print(f"Deleted old image from shared directory: {old_path}")
-                except Exception as e:
-                    print(f"Error removing old image: {e}")
-
-                # Delete the item from database
-                cursor.execute("DELETE FROM portfolio_items WHERE id = ?", (item['id'],))
-                print(f"Deleted existing portfolio item (ID: {item['id']}) for category: {normalized_category}")
-
-        # Handle the image update for the current item
-        if image_filename:
-            # If there's a previous image and it's different from the new one, delete it
-            old_image = target_item['image_filename']
-            if old_image != image_filename:
-                try:
-                    # Delete the old image from the shared directory
-                    old_path = os.path.join(app.config['PORTFOLIO_FOLDER'], old_image)
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
-                        print(f"Deleted old image from shared directory: {old_path}")
-                        print(f"This was a {normalized_category} portfolio item")
-                except Exception as e:
-                    print(f"Error removing old image: {e}")
-
-            # Update the image filename in the database
-            cursor.execute(
-                "UPDATE portfolio_items SET title = ?, description = ?, category = ?, image_filename = ? WHERE id = ?",
-                (title, description, normalized_category, image_filename, item_id)
-            )
-        else:
-            # Update without changing the image
-            cursor.execute(
-                "UPDATE portfolio_items SET title = ?, description = ?, category = ? WHERE id = ?",
-                (title, description, normalized_category, item_id)
-            )
-
-        # Commit changes
-        conn.commit()
+                # Update without changing the image
+                cursor.execute(
+                    "UPDATE portfolio_items SET title = ?, description = ?, category = ? WHERE id = ?",
+                    (title, description, normalized_category, item_id)
+                )
 
-        # Get the updated item
-        cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (item_id,))
-        updated_item = dict(cursor.fetchone())
+            # Get the updated item
+            cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (item_id,))
+            updated_item = dict(cursor.fetchone())
 
-        # Close connection
-        conn.close()
+        # Delete images no portfolio item refers to anymore
+        self.collect_unreferenced_images()
 
-        # Update in-memory list
-        # First remove any items with the same category (except the one we're updating)
-        self.portfolio_items = [item for item in self.portfolio_items
-                               if not (item['category'].lower() == normalized_category.lower() and item['id'] != item_id)]
+        # Refresh the in-memory cache
+        self._reload_portfolio()
 
-        # Then update the current item in the list
-        for i, item in enumerate(self.portfolio_items):
-            if item['id'] == item_id:
-                self.portfolio_items[i] = updated_item
-                break
-        else:
-            # If the item wasn't found in the list, add it
-            self.portfolio_items.append(updated_item)
-
-        # Save portfolio items to pickle file for sync script
-        self._save_portfolio_items_to_pickle()
+        # Save the portfolio snapshot for the sync script
+        self._save_portfolio_snapshot()
 
         print(f"Updated portfolio item: {updated_item['title']} (ID: {updated_item['id']})")
         if image_filename:
@@ -603,52 +1892,35 @@ class DatabaseStorage:
 
         return updated_item
 
+    @portfolio_writer
     def delete_portfolio_item(self, item_id):
         """Delete a portfolio item"""
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        # Get the item from database
-        cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (item_id,))
-        item = cursor.fetchone()
+        with self._transaction() as cursor:
+            # Get the item from database
+            cursor.execute("SELECT * FROM portfolio_items WHERE id = ?", (item_id,))
+            item = cursor.fetchone()
 
-        if not item:
-            conn.close()
-            return False
+            if not item:
+                return False
 
-        # Convert to dict for easier handling
-        item = dict(item)
+            # Convert to dict for easier handling
+            item = dict(item)
 
-        # Get the category for logging
-        category = item.get('category', 'Unknown')
+            # Get the category for logging
+            category = item.get('category', 'Unknown')
 
-        # Delete the image file from the shared directory
-        try:
-            # The image is now in the shared directory, which is linked to both
-            # the admin panel and app directories
-            image_path = os.path.join(app.config['PORTFOLIO_FOLDER'], item['image_filename'])
-            if os.path.exists(image_path):
-                os.remove(image_path)
-                print(f"Deleted image from shared directory: {image_path}")
-                print(f"This was a {category} portfolio item")
-        except Exception as e:
-            print(f"Error removing image: {e}")
+            # Delete the item from database (its image is released through image_refs)
+            cursor.execute("DELETE FROM portfolio_items WHERE id = ?", (item_id,))
+            print(f"This was a {category} portfolio item")
 
-        # Delete the item from database
-        cursor.execute("DELETE FROM portfolio_items WHERE id = ?", (item_id,))
-        conn.commit()
-        conn.close()
+        # Delete the image from the shared directory unless another item still uses it
+        self.collect_unreferenced_images()
 
-        # Remove the item from the in-memory list
-        for i, list_item in enumerate(self.portfolio_items):
-            if list_item['id'] == item_id:
-                del self.portfolio_items[i]
-                break
+        # Refresh the in-memory cache
+        self._reload_portfolio()
 
-        # Save portfolio items to pickle file for sync script
-        self._save_portfolio_items_to_pickle()
+        # Save the portfolio snapshot for the sync script
+        self._save_portfolio_snapshot()
 
         print(f"Deleted portfolio item (ID: {item_id})")
         return True
@@ -656,6 +1928,265 @@ class DatabaseStorage:
 # Create storage instance
 db = DatabaseStorage()
 
+class RenderedPageCache:
+    """LRU cache of rendered pages, each stored with the table versions it was rendered from
+
+    An entry is only returned while those versions are current. Any write to
+    the tables, by this worker, another worker or the Agency App, bumps a
+    version through the triggers and so invalidates the entry, which is then
+    dropped on its next lookup. Size is bounded by entry count and total
+    characters.
+    """
+
+    def __init__(self, max_entries=PAGE_CACHE_MAX_ENTRIES, max_size=PAGE_CACHE_MAX_SIZE):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, versions):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != versions:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, versions, html):
+        if len(html) > self.max_size:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (versions, html)
+            self._size += len(html)
+            while len(self._entries) > self.max_entries or self._size > self.max_size:
+                self._size -= len(self._entries.popitem(last=False)[1][1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+page_cache = RenderedPageCache()
+
+def render_cached_page(page, tables, template, build_context):
+    """Render a template through the page cache, keyed by page and user and checked against table versions
+
+    build_context() runs only on a miss, so a hit costs one version lookup.
+    Pages with pending flash messages are rendered fresh and not cached.
+    """
+    if session.get('_flashes'):
+        PAGE_CACHE_REQUESTS.labels(page, 'bypass').inc()
+        return render_template(template, **build_context())
+
+    # Read the versions before the data, so a concurrent write can only make an entry look stale
+    versions = db.get_table_versions(tables)
+    key = (page, session.get('user_id'))
+    html = page_cache.get(key, versions)
+    if html is not None:
+        PAGE_CACHE_REQUESTS.labels(page, 'hit').inc()
+        return html
+
+    PAGE_CACHE_REQUESTS.labels(page, 'miss').inc()
+    html = render_template(template, **build_context())
+    page_cache.put(key, versions, html)
+    return html
+
+# Background portfolio sync
+sync_worker = PortfolioSyncWorker()
+
+class OrderWriter:
+    """Background thread that group-commits orders submitted by request threads
+
+    SQLite allows one writer at a time, so rather than every request taking
+    the write lock and paying for its own commit, requests queue their orders
+    here. The writer takes everything queued since its last commit (up to
+    max_batch orders) and inserts it in a single transaction.
+    """
+
+    def __init__(self, storage, max_batch=ORDER_WRITER_MAX_BATCH):
+        self.storage = storage
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def submit(self, orders):
+        """Queue validated orders and return a Future that resolves to their ids
+
+        Cancelling the Future withdraws the orders, as long as the writer
+        hasn't started committing them.
+        """
+        future = Future()
+        with self._lock:
+            # Threads don't survive a fork, so each gunicorn worker starts its own writer
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name='order-writer',
+                                                daemon=True)
+                self._thread.start()
+            self._queue.put((orders, future))
+        return future
+
+    def _run(self, pending):
+        while True:
+            batch = []
+            total = 0
+            item = pending.get()
+            while True:
+                # Submissions withdrawn by a request that stopped waiting are dropped; once
+                # marked running here they can no longer be withdrawn
+                if item[1].set_running_or_notify_cancel():
+                    batch.append(item)
+                    total += len(item[0])
+                if total >= self.max_batch:
+                    break
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        try:
+            ids = self.storage.add_orders([order for orders, _ in batch for order in orders])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # Don't let one bad submission fail the others in its group
+            print(f"Group commit of {len(batch)} order submissions failed, retrying one by one: {e}")
+            for item in batch:
+                self._write([item])
+            return
+
+        offset = 0
+        for orders, future in batch:
+            future.set_result(ids[offset:offset + len(orders)])
+            offset += len(orders)
+
+# Single writer for orders arriving through /api/orders
+order_writer = OrderWriter(db)
+
+def format_order_cursor(order):
+    """Build the ?after= value pointing just past an order"""
+    return f"{order['created_at']},{order['id']}"
+
+def parse_order_cursor(value):
+    """Parse an ?after= value into a (created_at, id) tuple, or None if malformed"""
+    if not value or ',' not in value:
+        return None
+    created_at, order_id = value.rsplit(',', 1)
+    try:
+        return created_at, int(order_id)
+    except ValueError:
+        return None
+
+def build_search_query(text):
+    """Turn free text into an FTS5 query in which every word must match as a prefix
+
+    Only word characters are kept, so user input can never be parsed as FTS5 syntax.
+    """
+    return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', text or ''))
+
+def validate_order(data):
+    """Check one order submitted to /api/orders; returns (cleaned order, list of errors)"""
+    if not isinstance(data, dict):
+        return None, ['must be a JSON object']
+
+    order = {}
+    errors = []
+    for field in ORDER_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            if field in ORDER_REQUIRED_FIELDS:
+                errors.append(f"{field} is required")
+            order[field] = None
+        elif not isinstance(value, str):
+            errors.append(f"{field} must be a string")
+        elif len(value) > ORDER_FIELD_MAX_LENGTH:
+            errors.append(f"{field} is longer than {ORDER_FIELD_MAX_LENGTH} characters")
+        else:
+            order[field] = value
+
+    if order.get('email') and not EMAIL_PATTERN.match(order['email']):
+        errors.append('email is not a valid address')
+
+    order['status'] = data.get('status') or 'pending'
+    if order['status'] not in ORDER_STATUSES:
+        errors.append(f"status must be one of: {', '.join(ORDER_STATUSES)}")
+
+    return order, errors
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create and seed the database so worker boots don't have to"""
+    db.bootstrap()
+    print(f"Database ready: {db.db_path}")
+
+@app.cli.command('compact-changes')
+def compact_changes_command():
+    """Compact and expire the order change log (workers also do this hourly)"""
+    print(f"Removed {db.compact_order_changes()} order change log entries")
+
+@app.cli.command('optimize-db')
+def optimize_db_command():
+    """Refresh query planner statistics (workers also do this hourly)"""
+    db.optimize()
+    print("Query planner statistics refreshed")
+
+def api_client_authorized():
+    """Admins with a session, or API clients sending the ORDERS_API_TOKEN bearer token"""
+    if 'user_id' in session:
+        return True
+    return bool(ORDERS_API_TOKEN) and hmac.compare_digest(request.headers.get('Authorization', ''),
+                                                          f'Bearer {ORDERS_API_TOKEN}')
+
+def weak_etag(resource, *versions):
+    """Weak ETag for a resource built from the given change counters, the logged-in user and the release"""
+    raw = ':'.join(str(part) for part in (ETAG_RELEASE, session.get('user_id'), resource) + versions)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:24]
+
+def not_modified(etag):
+    """A 304 response if the client's If-None-Match already holds etag, otherwise None
+
+    Call it before rendering: it notes whether flash messages are waiting,
+    which rendering clears. While they are, it never answers 304, since the
+    cached copy can't show them.
+    """
+    g.flashes_pending = bool(session.get('_flashes'))
+    if g.flashes_pending or not request.if_none_match.contains_weak(etag):
+        return None
+    return tag_response(app.response_class(status=304), etag)
+
+def tag_response(response, etag):
+    """Attach the weak ETag, and have browsers revalidate on every use
+
+    A page that showed flash messages gets no ETag and isn't stored at all,
+    so a later revalidation can't bring the messages back with a 304.
+    """
+    response = make_response(response)
+    if g.get('flashes_pending') or session.get('_flashes'):
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # Login required decorator
 def login_required(f):
     @wraps(f)
@@ -666,6 +2197,43 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Request metrics
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    reset_sql_stats()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Unmatched URLs share one label so 404 scans can't blow up the series count
+        endpoint = request.endpoint or 'unmatched'
+        REQUEST_DURATION.labels(request.method, endpoint, response.status_code).observe(
+            time.perf_counter() - started)
+        queries, seconds = get_sql_stats()
+        REQUEST_SQL_QUERIES.labels(endpoint).observe(queries)
+        REQUEST_SQL_DURATION.labels(endpoint).observe(seconds)
+    return response
+
+# Hourly database upkeep runs on a background thread, started by each worker's first request
+@app.before_request
+def start_database_maintenance():
+    db.start_maintenance()
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics, summed over every gunicorn worker in multiprocess mode"""
+    if METRICS_TOKEN and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}'):
+        return 'Unauthorized', 401
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+
 # Routes
 @app.route('/')
 def index():
@@ -705,50 +2273,121 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    # Get counts for dashboard
-    pending_orders = len(db.get_orders(status='pending'))
-    in_progress_orders = len(db.get_orders(status='in_progress'))
-    completed_orders = len(db.get_orders(status='completed'))
-
-    # Get recent orders
-    recent_orders = db.get_orders()[:5]
-
-    # Get contact messages
-    contact_messages = db.get_contact_messages()[:5]
-
-    # Get portfolio items
-    portfolio_items = db.get_portfolio_items()
-
-    return render_template('dashboard.html',
-                          pending_orders=pending_orders,
-                          in_progress_orders=in_progress_orders,
-                          completed_orders=completed_orders,
-                          recent_orders=recent_orders,
-                          contact_messages=contact_messages,
-                          portfolio_items=portfolio_items)
+    def build_context():
+        # Get counts for dashboard
+        order_counts = db.count_orders_by_status()
+
+        return {
+            'pending_orders': order_counts['pending'],
+            'in_progress_orders': order_counts['in_progress'],
+            'completed_orders': order_counts['completed'],
+            'recent_orders': db.get_orders(limit=DASHBOARD_RECENT_LIMIT),
+            'contact_messages': db.get_contact_messages(limit=DASHBOARD_RECENT_LIMIT),
+            'portfolio_items': db.get_portfolio_items()
+        }
+
+    return render_cached_page('dashboard', ('orders', 'contact_messages', 'portfolio_items'),
+                              'dashboard.html', build_context)
 
 @app.route('/orders')
 @login_required
 def orders():
-    status_filter = request.args.get('status', '')
+    # Any order change invalidates every list URL; the URL itself tells filters and pages apart
+    etag = weak_etag('orders', db.get_table_version('orders'))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
 
-    if status_filter and status_filter != 'all':
-        orders = db.get_orders(status=status_filter)
-    else:
-        orders = db.get_orders()
-
-    return render_template('orders.html', orders=orders, current_filter=status_filter)
+    status_filter = request.args.get('status', '')
+    after = parse_order_cursor(request.args.get('after'))
+    limit = min(max(request.args.get('limit', ORDERS_PAGE_SIZE, type=int), 1), ORDERS_MAX_PAGE_SIZE)
+    search_query = request.args.get('q', '').strip()
+    status = status_filter if status_filter and status_filter != 'all' else None
+
+    # Search results are ordered by relevance, so they page by number instead of by cursor
+    if search_query:
+        page = max(request.args.get('page', 1, type=int), 1)
+        orders = db.search(search_query, status=status, limit=limit + 1, offset=(page - 1) * limit)
+        next_page = page + 1 if len(orders) > limit else None
+        return tag_response(render_template('orders.html', orders=orders[:limit], current_filter=status_filter,
+                                            search_query=search_query, page=page, next_page=next_page,
+                                            limit=limit), etag)
+
+    # Fetch one extra row to know whether there is a next page
+    orders = db.get_orders(status=status, after=after, limit=limit + 1)
+
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = format_order_cursor(orders[-1])
+
+    return tag_response(render_template('orders.html', orders=orders, current_filter=status_filter,
+                                        next_cursor=next_cursor, limit=limit), etag)
+
+@app.route('/orders/export')
+@login_required
+def export_orders():
+    """Stream orders as CSV or NDJSON, filtered by ?status= and an inclusive ?from=/?to= date range"""
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    status = request.args.get('status') or None
+    if status == 'all':
+        status = None
+    if status and status not in ORDER_STATUSES:
+        return jsonify({'error': f"status must be one of: {', '.join(ORDER_STATUSES)}"}), 400
+
+    dates = {}
+    for name in ('from', 'to'):
+        value = request.args.get(name)
+        if value:
+            try:
+                dates[name] = datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+            except ValueError:
+                return jsonify({'error': f"{name} must be a date like 2024-01-31"}), 400
+
+    batches = db.iter_orders(status=status, date_from=dates.get('from'), date_to=dates.get('to'))
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        header_written = False
+        for columns, rows in batches:
+            if not header_written:
+                writer.writerow(columns)
+                header_written = True
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def generate_ndjson():
+        for columns, rows in batches:
+            yield ''.join(json.dumps(dict(zip(columns, row))) + '\n' for row in rows)
+
+    filename = f"orders-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{export_format}"
+    return app.response_class(generate_csv() if export_format == 'csv' else generate_ndjson(),
+                              mimetype=EXPORT_FORMATS[export_format],
+                              headers={'Content-Disposition': f'attachment; filename="{filename}"'})
 
 @app.route('/orders/<int:order_id>')
 @login_required
 def view_order(order_id):
+    # Every insert and update of an order is logged, so its latest seq versions just this order
+    seq = db.get_order_change_seq(order_id)
+    etag = weak_etag('order', order_id, seq)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     order = db.get_order(order_id)
 
     if not order:
         flash('Order not found', 'error')
         return redirect(url_for('orders'))
 
-    return render_template('order_details.html', order=order)
+    return tag_response(render_template('order_details.html', order=order), etag)
 
 @app.route('/orders/<int:order_id>/update', methods=['POST'])
 @login_required
@@ -768,30 +2407,207 @@ def update_order(order_id):
 
     return redirect(url_for('view_order', order_id=order_id))
 
+@app.route('/orders/bulk-update', methods=['POST'])
+@login_required
+def bulk_update_orders():
+    """Set one status on many orders, from the /orders multi-select form or as JSON
+
+    JSON callers send {"order_ids": [...], "status": "..."} and get the
+    per-order results back.
+    """
+    def invalid_request():
+        if request.is_json:
+            return jsonify({'error': 'order_ids must be a list of order ids and status one of: ' +
+                                     ', '.join(ORDER_STATUSES)}), 400
+        flash('Please select orders and a valid status', 'error')
+        return redirect(url_for('orders'))
+
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return invalid_request()
+        order_ids = payload.get('order_ids')
+        status = payload.get('status')
+        # Only real integers: a string would be read digit by digit, and 1.5 or true cast to an id
+        if not isinstance(order_ids, list) or not all(type(order_id) is int for order_id in order_ids):
+            return invalid_request()
+    else:
+        order_ids = request.form.getlist('order_ids')
+        status = request.form.get('status')
+
+    try:
+        results = db.update_order_statuses(order_ids, status)
+    except (TypeError, ValueError):
+        return invalid_request()
+
+    if request.is_json:
+        return jsonify({'status': status, 'results': {str(order_id): result for order_id, result in results.items()}})
+
+    updated = sum(1 for result in results.values() if result == 'updated')
+    missing = sum(1 for result in results.values() if result == 'not_found')
+    if results:
+        flash(f"Updated {updated} of {len(results)} selected orders", 'success')
+    else:
+        flash('No orders selected', 'error')
+    if missing:
+        flash(f"{missing} selected orders no longer exist", 'error')
+
+    return redirect(url_for('orders', status=request.form.get('current_filter') or None))
+
+@app.route('/api/orders', methods=['POST'])
+def create_orders():
+    """Create one order, or a batch, from JSON and return the assigned ids
+
+    Accepts a single order object, a list of them, or {"orders": [...]}.
+    Batches are all-or-nothing: if any order is invalid, none are saved.
+    """
+    if not api_client_authorized():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    payload = request.get_json(silent=True)
+    single = isinstance(payload, dict) and 'orders' not in payload
+    submitted = [payload] if single else payload.get('orders') if isinstance(payload, dict) else payload
+    if not isinstance(submitted, list) or not submitted:
+        return jsonify({'error': 'Expected an order object, a list of orders or {"orders": [...]}'}), 400
+    if len(submitted) > ORDERS_API_MAX_BATCH:
+        return jsonify({'error': f"At most {ORDERS_API_MAX_BATCH} orders per request"}), 413
+
+    orders = []
+    errors = {}
+    for index, data in enumerate(submitted):
+        order, order_errors = validate_order(data)
+        if order_errors:
+            errors[str(index)] = order_errors
+        orders.append(order)
+    if errors:
+        return jsonify({'errors': errors['0'] if single else errors}), 400
+
+    future = order_writer.submit(orders)
+    try:
+        try:
+            ids = future.result(timeout=ORDER_WRITER_TIMEOUT)
+        except TimeoutError:
+            # Withdraw the orders so that a retry can't duplicate them. If the writer is already
+            # committing them, wait for that commit instead; busy_timeout bounds it
+            if future.cancel():
+                raise
+            ids = future.result()
+    except (TimeoutError, sqlite3.OperationalError) as e:
+        print(f"Error saving orders from the API: {str(e) or 'timed out waiting for the order writer'}")
+        return jsonify({'error': 'Orders could not be saved right now, please retry'}), 503, {'Retry-After': '1'}
+
+    if single:
+        return jsonify({'id': ids[0]}), 201
+    return jsonify({'ids': ids}), 201
+
+@app.route('/api/orders/changes')
+def order_changes():
+    """Incremental order sync: changes after ?since=<seq>, up to ?limit=
+
+    Clients store next_since and pass it back on their next call. A 410
+    means deletions the client hasn't seen have expired from the log, so it
+    should drop its copy and resync from since=0.
+    """
+    if not api_client_authorized():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    since = max(request.args.get('since', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', ORDER_CHANGES_PAGE_SIZE, type=int), 1), ORDER_CHANGES_MAX_PAGE_SIZE)
+
+    changes = db.get_order_changes(since, limit + 1)
+    if changes is None:
+        return jsonify({'error': 'Cursor is older than the retained deletions, resync from since=0',
+                        'resync': True}), 410
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    return jsonify({
+        'changes': changes,
+        'next_since': changes[-1]['seq'] if changes else since,
+        'has_more': has_more
+    })
+
 @app.route('/api/check-notifications')
 @login_required
 def check_notifications():
+    # Long-poll: with ?version=<last seen>&wait=<seconds>, hold the request until orders change
+    since = request.args.get('version', type=int)
+    wait = min(request.args.get('wait', 0, type=float), NOTIFICATIONS_MAX_WAIT)
+
+    if since is not None and wait > 0:
+        version = db.wait_for_table_change('orders', since, wait)
+    else:
+        version = db.get_table_version('orders')
+
+    # Polls that send back the last ETag get a 304 until an order changes
+    etag = weak_etag('notifications', version)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     # Get count of new orders (pending status)
-    pending_orders = len(db.get_orders(status='pending'))
+    pending_orders = db.count_orders_by_status()['pending']
 
-    return jsonify({
-        'pending_orders': pending_orders
+    return tag_response(jsonify({
+        'pending_orders': pending_orders,
+        'version': version
+    }), etag)
+
+@app.route('/api/notifications/stream')
+@login_required
+def notifications_stream():
+    """Server-Sent Events stream that pushes the pending count whenever orders change"""
+    last_version = request.headers.get('Last-Event-ID', type=int)
+
+    def events():
+        version = last_version
+        started = time.monotonic()
+        yield f"retry: {int(NOTIFICATIONS_POLL_INTERVAL * 5000)}\n\n"
+
+        while time.monotonic() - started < NOTIFICATIONS_STREAM_TIMEOUT:
+            current = db.wait_for_table_change('orders', version, NOTIFICATIONS_HEARTBEAT)
+            if current == version:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+
+            version = current
+            payload = json.dumps({'pending_orders': db.count_orders_by_status()['pending'], 'version': version})
+            yield f"id: {version}\nevent: orders\ndata: {payload}\n\n"
+
+    return app.response_class(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
 
+@app.route('/api/dashboard/trends')
+@login_required
+def dashboard_trends():
+    """Daily order series for the dashboard chart, over ?days= (default 30)"""
+    days = min(max(request.args.get('days', TREND_DEFAULT_DAYS, type=int), 1), TREND_MAX_DAYS)
+    return jsonify(db.get_order_trends(days))
+
+@app.route('/api/sync-status')
+@login_required
+def sync_status():
+    """Report the background portfolio sync state"""
+    return jsonify(sync_worker.status())
+
 # Portfolio management routes
 @app.route('/portfolio')
 @login_required
 def portfolio():
-    portfolio_items = db.get_portfolio_items()
-    return render_template('portfolio.html', portfolio_items=portfolio_items)
+    etag = weak_etag('portfolio', db.get_table_version('portfolio_items'))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    return tag_response(render_cached_page('portfolio', ('portfolio_items',), 'portfolio.html',
+                                           lambda: {'portfolio_items': db.get_portfolio_items()}), etag)
 
 @app.route('/portfolio/add', methods=['GET', 'POST'])
 @login_required
 def add_portfolio():
-    # Import modules at the function level to avoid scope issues
-    import os
-    import uuid
-
     if request.method == 'POST':
         title = request.form.get('title')
         description = request.form.get('description')
@@ -813,23 +2629,20 @@ def add_portfolio():
             return render_template('portfolio_form.html')
 
         if image_file and allowed_file(image_file.filename):
-            # Generate a unique filename
-            filename = secure_filename(image_file.filename)
-            filename = f"{uuid.uuid4().hex}_{filename}"
+            # Save the file under its content hash
+            filename, _ = store_uploaded_image(image_file)
 
-            # Save the file
+            # Resize into thumb/medium/full variants in the background; a reused file may
+            # predate the variants or have lost some, so check rather than rely on it being new
             image_path = os.path.join(app.config['PORTFOLIO_FOLDER'], filename)
-            image_file.save(image_path)
+            if image_variants_missing(image_path):
+                schedule_image_variants(image_path)
 
             # Add the portfolio item
             db.add_portfolio_item(title, description, category, filename)
 
-            # Sync portfolio items to app database
-            try:
-                # Run the sync function directly
-                run_sync_script()
-            except Exception as e:
-                print(f"Error running portfolio sync script: {e}")
+            # Sync portfolio items to app database in the background
+            sync_worker.request_sync()
 
             flash('Portfolio item added successfully', 'success')
             return redirect(url_for('portfolio'))
@@ -841,10 +2654,6 @@ def add_portfolio():
 @app.route('/portfolio/<int:item_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_portfolio(item_id):
-    # Import modules at the function level to avoid scope issues
-    import os
-    import uuid
-
     portfolio_item = db.get_portfolio_item(item_id)
 
     if not portfolio_item:
@@ -866,13 +2675,14 @@ def edit_portfolio(item_id):
             image_file = request.files['image']
 
             if allowed_file(image_file.filename):
-                # Generate a unique filename
-                filename = secure_filename(image_file.filename)
-                filename = f"{uuid.uuid4().hex}_{filename}"
+                # Save the file under its content hash
+                filename, _ = store_uploaded_image(image_file)
 
-                # Save the file
+                # Resize into thumb/medium/full variants in the background; a reused file may
+                # predate the variants or have lost some, so check rather than rely on it being new
                 image_path = os.path.join(app.config['PORTFOLIO_FOLDER'], filename)
-                image_file.save(image_path)
+                if image_variants_missing(image_path):
+                    schedule_image_variants(image_path)
 
                 # Set the image filename to be used in the update
                 image_filename = filename
@@ -883,12 +2693,8 @@ def edit_portfolio(item_id):
         # Update the portfolio item
         db.update_portfolio_item(item_id, title, description, category, image_filename)
 
-        # Sync portfolio items to app database
-        try:
-            # Run the sync function directly
-            run_sync_script()
-        except Exception as e:
-            print(f"Error running portfolio sync script: {e}")
+        # Sync portfolio items to app database in the background
+        sync_worker.request_sync()
 
         flash('Portfolio item updated successfully', 'success')
         return redirect(url_for('portfolio'))
@@ -902,12 +2708,8 @@ def delete_portfolio(item_id):
     success = db.delete_portfolio_item(item_id)
 
     if success:
-        # Sync portfolio items to app database
-        try:
-            # Run the sync function directly
-            run_sync_script()
-        except Exception as e:
-            print(f"Error running portfolio sync script: {e}")
+        # Sync portfolio items to app database in the background
+        sync_worker.request_sync()
 
         flash('Portfolio item deleted successfully', 'success')
     else:
@@ -918,39 +2720,40 @@ def delete_portfolio(item_id):
 @app.route('/uploads/portfolio/<filename>')
 def portfolio_image(filename):
     """Serve portfolio images from the shared directory"""
-    # Check if the file exists in the shared directory
-    if os.path.exists(os.path.join(app.config['PORTFOLIO_FOLDER'], filename)):
-        return send_from_directory(app.config['PORTFOLIO_FOLDER'], filename)
+    # ?size=thumb|medium|full serves a resized variant, as WebP when the browser accepts it
+    size = request.args.get('size')
+    if size in IMAGE_VARIANT_SIZES:
+        ext = request.args.get('format')
+        if ext not in IMAGE_VARIANT_FORMATS:
+            ext = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpg'
+
+        response = send_portfolio_file(variant_filename(filename, size, ext))
+        if response is not None:
+            response.vary.add('Accept')
+            return response
+        # Variants are still being generated (or predate the pipeline), fall back to the original.
+        # Only briefly cacheable, so the variant replaces it once it exists
+        response = send_portfolio_file(filename, immutable=False)
+        if response is not None:
+            response.vary.add('Accept')
+            return response
     else:
-        # If not found, try to create a sample image
-        try:
-            # Create a sample image
-            from PIL import Image, ImageDraw
-
-            # Determine color based on filename
-            if 'printing' in filename.lower():
-                color = (200, 50, 50)  # Red for Printing Press
-            elif 'seo' in filename.lower():
-                color = (50, 150, 50)  # Green for SEO
-            else:
-                color = (50, 50, 200)  # Blue for Packages
-
-            # Create a colored image
-            img = Image.new('RGB', (400, 250), color=color)
-            draw = ImageDraw.Draw(img)
-
-            # Add a white border
-            draw.rectangle([10, 10, 390, 240], outline=(255, 255, 255), width=5)
-
-            # Save the image
-            filepath = os.path.join(app.config['PORTFOLIO_FOLDER'], filename)
-            img.save(filepath, 'JPEG')
-            print(f"Created sample image on-demand: {filepath}")
-
-            return send_from_directory(app.config['PORTFOLIO_FOLDER'], filename)
-        except Exception as e:
-            print(f"Error creating sample image: {e}")
-            return "Image not found", 404
+        # Serve the file if it exists in the shared directory
+        response = send_portfolio_file(filename)
+        if response is not None:
+            return response
+
+    # If not found, serve a cached placeholder in the category colour (nothing is written to disk)
+    try:
+        data = render_placeholder_image(PLACEHOLDER_COLORS[placeholder_category(filename)])
+    except Exception as e:
+        print(f"Error creating placeholder image: {e}")
+        return "Image not found", 404
+
+    response = app.response_class(data, mimetype='image/jpeg')
+    response.cache_control.public = True
+    response.cache_control.max_age = PLACEHOLDER_MAX_AGE
+    return response
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)